@@ -27,6 +27,7 @@ class WaypointConfig:
     MIN_WAYPOINT_DISTANCE = 2.0      # Minimum separation distance (meters)
     ARRIVAL_THRESHOLD = 2.0          # Distance for waypoint completion (meters)
     MAX_WAYPOINT_TIMEOUT = 120.0     # Maximum time per waypoint (seconds)
+    INTER_WAYPOINT_PAUSE_S = 0.2     # Pause after reaching a waypoint, 0 disables (seconds)
     
     # Battery emergency thresholds
     CRITICAL_BATTERY_LEVEL = 30.0    # Emergency action trigger (percentage)
@@ -67,6 +68,7 @@ class WaypointConfig:
             'min_waypoint_distance': cls.MIN_WAYPOINT_DISTANCE,
             'arrival_threshold': cls.ARRIVAL_THRESHOLD,
             'max_waypoint_timeout': cls.MAX_WAYPOINT_TIMEOUT,
+            'inter_waypoint_pause_s': cls.INTER_WAYPOINT_PAUSE_S,
             'critical_battery_level': cls.CRITICAL_BATTERY_LEVEL,
             'low_battery_warning': cls.LOW_BATTERY_WARNING,
             'emergency_battery_level': cls.EMERGENCY_BATTERY_LEVEL,
@@ -392,7 +394,7 @@ class SafetyConfig:
 
 import logging
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 class FlightLogger:
     """Enhanced flight operations logger with structured logging."""
@@ -436,8 +438,31 @@ class FlightLogger:
         """Log safety violation."""
         self.logger.warning(f"SAFETY_VIOLATION: {violation}, data={data}")
     
+    def log_events(self, events: List[Tuple[str, Dict[str, Any]]]):
+        """Log a batch of (event_type, data) pairs."""
+        for event_type, data in events:
+            self.log_event(event_type, data)
+    
+    @staticmethod
+    def _event_level(event_type: str) -> int:
+        """Level log_event uses for event_type."""
+        if event_type in ("safety_check_failed", "gps_check_failed", "battery_check_failed"):
+            return logging.WARNING
+        if event_type == 'safety_check_passed' or (event_type and event_type.startswith('waypoint_progress')):
+            return logging.INFO
+        if event_type in FlightLoggingConfig.LOG_EVENT_TYPES:
+            return logging.ERROR if 'emergency' in event_type.lower() else logging.INFO
+        return logging.WARNING
+    
+    def would_log(self, event_type: str) -> bool:
+        """Whether log_event would emit event_type at the current log level."""
+        return self.logger.isEnabledFor(self._event_level(event_type))
+    
     def log_event(self, event_type: str, data: Dict[str, Any]):
         """Log generic flight event with structured data."""
+        log_level = self._event_level(event_type)
+        if not self.logger.isEnabledFor(log_level):
+            return
         # Human-friendly logging for important safety events
         try:
             if event_type in ("safety_check_failed", "gps_check_failed", "battery_check_failed"):
@@ -494,8 +519,7 @@ class FlightLogger:
             pass
 
         if event_type in FlightLoggingConfig.LOG_EVENT_TYPES:
-            level = logging.ERROR if 'emergency' in event_type.lower() else logging.INFO
-            self.logger.log(level, f"EVENT: type={event_type}, data={data}")
+            self.logger.log(log_level, f"EVENT: type={event_type}, data={data}")
         else:
             # For unknown events, log a shorter summary instead of dumping large dicts
             try:
@@ -53,6 +53,9 @@ async def main():
 
 if __name__ == "__main__":
     try:
+        from src.communication.ws_server import use_fast_event_loop
+        if use_fast_event_loop():
+            logger.info("Using uvloop event loop")
         asyncio.run(main())
     except KeyboardInterrupt:
         print("\n👋 Goodbye!")
@@ -3,10 +3,10 @@ Command Handlers for Drone Control Operations
 Processes WebSocket commands with comprehensive error handling and logging.
 """
 
-import json
 import time
 import logging
 import asyncio
+import functools
 from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 import sys
@@ -35,6 +35,23 @@ _command_rate_limits = {
     'connect': 0.1    # 0.1 seconds between connect attempts (allow rapid retries)
 }
 COMMAND_TIMEOUT = 30.0  # seconds
+MISSION_BROADCAST_BATCH = 50  # Clients per send batch for waypoint mission broadcasts
+
+# Fixed responses returned as shared objects - never mutate them. The server
+# pre-encodes everything in CONSTANT_RESPONSES once.
+_RESP_NO_CONTROLLER = {"status": "error", "detail": "no controller available"}
+_RESP_STATUS = {
+    True: {"status": "ok", "detail": "drone is connected", "drone_connected": True},
+    False: {"status": "ok", "detail": "drone is not connected", "drone_connected": False},
+}
+_RESP_DISCONNECTED = {"status": "ok", "detail": "drone disconnected and telemetry stopped", "drone_connected": False}
+_RESP_RECONNECTED = {"status": "ok", "detail": "telemetry reconnected"}
+_RESP_MESSAGE_SENT = {"status": "ok", "detail": "message broadcast"}
+_RESP_NO_MISSION = {"status": "ok", "detail": "no active mission", "mission": None}
+CONSTANT_RESPONSES = (
+    _RESP_NO_CONTROLLER, _RESP_STATUS[True], _RESP_STATUS[False],
+    _RESP_DISCONNECTED, _RESP_RECONNECTED, _RESP_MESSAGE_SENT, _RESP_NO_MISSION,
+)
 MAX_COMMAND_HISTORY = 100
 
 
@@ -188,7 +205,7 @@ async def handle_disconnect(stop_telemetry_func, conn) -> Dict[str, Any]:
     # Handle disconnect command
     try:
         await stop_telemetry_func()
-        return {"status": "ok", "detail": "drone disconnected and telemetry stopped", "drone_connected": False}
+        return _RESP_DISCONNECTED
     except Exception as e:
         return {"status": "error", "detail": f"disconnect failed: {str(e)}", "drone_connected": False}
 
@@ -196,20 +213,19 @@ async def handle_disconnect(stop_telemetry_func, conn) -> Dict[str, Any]:
 async def handle_reconnect(reconnect_telemetry_func) -> Dict[str, Any]:
     # Handle reconnect command
     await reconnect_telemetry_func()
-    return {"status": "ok", "detail": "telemetry reconnected"}
+    return _RESP_RECONNECTED
 
 
 async def handle_status(drone_connected: bool) -> Dict[str, Any]:
     # Handle status command
-    detail = "drone is connected" if drone_connected else "drone is not connected"
-    return {"status": "ok", "detail": detail, "drone_connected": drone_connected}
+    return _RESP_STATUS[bool(drone_connected)]
 
 
 async def handle_arm(conn) -> Dict[str, Any]:
     # Handle arm command.
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         result = await controller.arm()
@@ -222,7 +238,7 @@ async def handle_disarm(conn) -> Dict[str, Any]:
     # Handle disarm command
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         result = await controller.disarm()
@@ -235,7 +251,7 @@ async def handle_arm_and_takeoff(conn, altitude: float = 5.0) -> Dict[str, Any]:
     """Handle arm and takeoff command - prevents auto-disarm timeout."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         result = await controller.arm_and_takeoff(altitude)
@@ -249,8 +265,8 @@ async def handle_message(payload: dict, broadcast_func) -> Dict[str, Any]:
     # Handle message broadcast command
     try:
         msg = payload.get("message", "")
-        await broadcast_func(json.dumps({"type": "message", "message": msg}))
-        return {"status": "ok", "detail": "message broadcast"}
+        await broadcast_func({"type": "message", "message": msg})
+        return _RESP_MESSAGE_SENT
     except Exception as e:
         return {"status": "error", "detail": f"broadcast failed: {e}"}
 
@@ -259,7 +275,7 @@ async def handle_sitl_setup(conn) -> Dict[str, Any]:
     """Handle SITL setup command - configure vehicle for SITL use."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         result = await controller.setup_sitl_connection()
@@ -273,7 +289,7 @@ async def handle_takeoff(conn, altitude: float = 10.0) -> Dict[str, Any]:
     """Handle takeoff command."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         # Validate altitude
@@ -291,7 +307,7 @@ async def handle_land(conn, payload: dict = None) -> Dict[str, Any]:
     """Handle land command - safely land at current location."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         # Check if this is an emergency landing request
@@ -323,7 +339,7 @@ async def handle_emergency_disarm(conn) -> Dict[str, Any]:
     """Handle emergency disarm command with mandatory confirmation."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         # Emergency disarm requires explicit confirmation for safety
@@ -337,7 +353,7 @@ async def handle_rtl(conn, payload: dict = None) -> Dict[str, Any]:
     """Handle return to launch command - return home and land."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         # Check if this is an emergency RTL request
@@ -369,7 +385,7 @@ async def handle_fly_timed(conn, altitude: float = 5.0, duration: float = 5.0, b
     """Handle timed flight mission - fly at altitude for duration then RTL."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         # Validate parameters
@@ -389,14 +405,14 @@ async def handle_mission_status(conn) -> Dict[str, Any]:
     """Handle mission status request."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         mission_status = controller.get_mission_status()
         if mission_status:
             return {"status": "ok", "detail": "mission active", "mission": mission_status}
         else:
-            return {"status": "ok", "detail": "no active mission", "mission": None}
+            return _RESP_NO_MISSION
     except Exception as e:
         return {"status": "error", "detail": f"mission status exception: {e}"}
 
@@ -405,7 +421,7 @@ async def handle_set_throttle(conn, throttle_percent: float = 0.0) -> Dict[str,
     """Handle throttle control command."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         # Validate throttle range
@@ -423,7 +439,7 @@ async def handle_release_throttle(conn) -> Dict[str, Any]:
     """Handle release throttle control command."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         result = await controller.release_throttle_control()
@@ -436,7 +452,7 @@ async def handle_emergency_land(conn) -> Dict[str, Any]:
     """Handle emergency land command - critical safety function."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         result = await controller.emergency_land()
@@ -449,7 +465,7 @@ async def handle_verify_home(conn) -> Dict[str, Any]:
     """Handle home location verification command."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         is_valid, message = controller.verify_home_location()
@@ -472,7 +488,7 @@ async def handle_force_land_here(conn) -> Dict[str, Any]:
     """Handle force land here command - DANGEROUS, lands at current location."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         result = await controller.force_land_here()
@@ -486,7 +502,7 @@ async def handle_battery_emergency_response(conn, payload: dict) -> Dict[str, An
     """Handle user response to battery emergency prompt."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         # Extract data from nested payload structure
@@ -565,16 +581,13 @@ COMMAND_HANDLERS = {
 }
 
 
-async def execute_command(
-    command_type: str,
-    payload: Optional[dict],
-    conn,
-    drone_connected: bool,
-    start_telemetry_func,
-    stop_telemetry_func,
-    reconnect_telemetry_func,
-    broadcast_func
-) -> Dict[str, Any]:
+async def execute_command(command_type: str, payload: Optional[dict], state) -> Dict[str, Any]:
+    """
+    Run one command against the server state.
+
+    state provides conn, drone_connected and the server operations
+    start_telemetry, stop_telemetry, reconnect_telemetry and broadcast.
+    """
     # CRITICAL: Check for command conflicts first
     conflict_ok, conflict_msg = check_command_conflicts(command_type)
     if not conflict_ok:
@@ -584,155 +597,31 @@ async def execute_command(
     _active_commands[command_type] = True
     _last_command_time[command_type] = time.time()
     
-    # Log command execution
-    print(f"[COMMAND] Executing: {command_type.upper()}")
-    if payload:
-        print(f"[COMMAND] Parameters: {payload}")
+    # Log command execution; payloads (e.g. waypoint lists) are only
+    # formatted when debug logging is on
+    logger.info("[COMMAND] Executing: %s", command_type.upper())
+    if payload and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[COMMAND] Parameters: %s", payload)
     
     try:
         # Execute the command based on its type
         handler = COMMAND_HANDLERS.get(command_type)
         if not handler:
-            print(f"[COMMAND] ERROR - Unknown command: {command_type}")
+            logger.error("[COMMAND] ERROR - Unknown command: %s", command_type)
             return {"status": "error", "detail": f"unknown command: {command_type}"}
         
-        if command_type == "connect":
-            result = await handler(start_telemetry_func, conn)
-        elif command_type == "disconnect":
-            result = await handler(stop_telemetry_func, conn)
-        elif command_type == "reconnect":
-            result = await handler(reconnect_telemetry_func)
-        elif command_type == "status":
-            result = await handler(drone_connected)
-        elif command_type in ["arm", "disarm", "emergency_disarm", "sitl_setup", "mission_status", "release_throttle", "emergency_land", "verify_home", "force_land_here"]:
-            result = await handler(conn)
-        elif command_type in ["land", "rtl"]:
-            # These commands now support payload for emergency override
-            result = await handler(conn, payload)
-        elif command_type == "arm_and_takeoff":
-            # Handle arm + takeoff with optional altitude parameter
-            altitude = 5.0  # default altitude
-            if payload and "altitude" in payload:
-                try:
-                    altitude = float(payload["altitude"])
-                except (ValueError, TypeError):
-                    return {"status": "error", "detail": "invalid altitude parameter"}
-            result = await handler(conn, altitude)
-        elif command_type == "takeoff":
-            # Handle takeoff with optional altitude parameter
-            altitude = 10.0  # default altitude
-            if payload and "altitude" in payload:
-                try:
-                    altitude = float(payload["altitude"])
-                except (ValueError, TypeError):
-                    return {"status": "error", "detail": "invalid altitude parameter"}
-            result = await handler(conn, altitude)
-        elif command_type == "fly_timed":
-            # Handle timed flight with altitude and duration parameters
-            altitude = 5.0  # default altitude
-            duration = 5.0  # default duration
-            if payload:
-          
-                # Extract nested payload parameters (fix for parameter extraction bug)
-                nested_payload = payload.get('payload', payload)  # Use nested payload if it exists, otherwise use payload directly
-           
-                try:
-                    if "altitude" in nested_payload:
-                        altitude = float(nested_payload["altitude"])
-                        print(f"[COMMAND] Using altitude: {altitude}m")
-                    else:
-                        print(f"[COMMAND] DEBUG - 'altitude' not found in nested payload")
-                    if "duration" in nested_payload:
-                        duration = float(nested_payload["duration"])
-                        print(f"[COMMAND] Using duration: {duration}s")
-                    else:
-                        print(f"[COMMAND] DEBUG - 'duration' not found in nested payload")
-                except (ValueError, TypeError) as e:
-                    print(f"[COMMAND] ERROR - Invalid parameter conversion: {e}")
-                    return {"status": "error", "detail": "invalid altitude or duration parameter"}
-            else:
-                print("[COMMAND] DEBUG - No payload received, using defaults")
-            print(f"[COMMAND] Final parameters - Altitude: {altitude}m, Duration: {duration}s")
-            print(f"[COMMAND] DEBUG - About to call handler with: conn={conn}, altitude={altitude}, duration={duration}")
-            result = await handler(conn, altitude, duration, broadcast_func)
-        elif command_type == "set_throttle":
-            # Handle throttle control with throttle percentage parameter
-            throttle_percent = 0.0  # default throttle
-            if payload and "throttle" in payload:
-                try:
-                    throttle_percent = float(payload["throttle"])
-                except (ValueError, TypeError):
-                    return {"status": "error", "detail": "invalid throttle parameter"}
-            result = await handler(conn, throttle_percent)
-        elif command_type == "message":
-            result = await handler(payload, broadcast_func)
-        elif command_type == "battery_emergency_response":
-            result = await handler(conn, payload)
-        elif command_type == "execute_waypoint_mission":
-            # Handle waypoint mission execution
-            # The waypoints are nested in payload.payload
-            inner_payload = payload.get("payload", {}) if payload else {}
-            waypoints = inner_payload.get("waypoints", [])
-            takeoff_altitude = inner_payload.get("takeoff_altitude")
-            result = await handle_execute_waypoint_mission(conn, waypoints, takeoff_altitude, broadcast_func)
-        elif command_type in ["waypoint_mission_status", "stop_waypoint_mission"]:
-            # Commands that only need conn parameter
-            result = await handler(conn)
-        elif command_type == "set_waypoint_override":
-            override = payload.get("override", True) if payload else True
-            result = await handle_set_waypoint_override(conn, override)
-        elif command_type == "fly_to_waypoint":
-            if not payload:
-                result = {"status": "error", "detail": "missing waypoint coordinates"}
-            else:
-                lat = payload.get("latitude")
-                lon = payload.get("longitude") 
-                alt = payload.get("altitude", 20.0)
-                result = await handle_fly_to_waypoint(conn, lat, lon, alt)
-        elif command_type == "validate_waypoints":
-            waypoints = payload.get("waypoints", []) if payload else []
-            result = await handle_validate_waypoints(conn, waypoints)
-        elif command_type == "calculate_mission_stats":
-            waypoints = payload.get("waypoints", []) if payload else []
-            result = await handle_calculate_mission_stats(conn, waypoints)
-        elif command_type == "generate_grid_mission":
-            if not payload:
-                result = {"status": "error", "detail": "missing grid parameters"}
-            else:
-                result = await handle_generate_grid_mission(
-                    conn, 
-                    payload.get("start_lat"), 
-                    payload.get("start_lon"),
-                    payload.get("grid_size", 5),
-                    payload.get("spacing", 50.0),
-                    payload.get("altitude", 20.0)
-                )
-        elif command_type == "generate_circular_mission":
-            if not payload:
-                result = {"status": "error", "detail": "missing circular parameters"}
-            else:
-                result = await handle_generate_circular_mission(
-                    conn,
-                    payload.get("center_lat"),
-                    payload.get("center_lon"), 
-                    payload.get("radius_meters", 100.0),
-                    payload.get("num_points", 8),
-                    payload.get("altitude", 20.0)
-                )
-        elif command_type == "waypoint_emergency_response":
-            prompt_id = payload.get("prompt_id", "") if payload else ""
-            choice = payload.get("choice", "") if payload else ""
-            result = await handle_waypoint_emergency_response(conn, prompt_id, choice)
-        else:
+        runner = _COMMAND_RUNNERS.get(command_type)
+        if runner is None:
             result = {"status": "error", "detail": f"handler not implemented for: {command_type}"}
+        else:
+            result = await runner(handler, payload, state)
         
         # Log command result
         status = result.get("status", "unknown")
         if status == "ok":
-            print(f"[COMMAND] SUCCESS - {command_type.upper()} completed")
+            logger.info("[COMMAND] SUCCESS - %s completed", command_type.upper())
         else:
-            detail = result.get("detail", "no details")
-            print(f"[COMMAND] FAILED - {command_type.upper()}: {detail}")
+            logger.warning("[COMMAND] FAILED - %s: %s", command_type.upper(), result.get("detail", "no details"))
         
         return result
         
@@ -749,7 +638,7 @@ async def handle_execute_waypoint_mission(conn, waypoints: list, takeoff_altitud
     """Handle waypoint mission execution command with emergency response capability."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         # Validate waypoints format
@@ -801,7 +690,7 @@ async def handle_waypoint_mission_status(conn) -> Dict[str, Any]:
     """Handle waypoint mission status query."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         mission_status = controller.get_waypoint_mission_status()
@@ -814,7 +703,7 @@ async def handle_stop_waypoint_mission(conn) -> Dict[str, Any]:
     """Handle stop waypoint mission command."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         result = controller.stop_waypoint_mission()
@@ -830,7 +719,7 @@ async def handle_cancel_takeoff(conn) -> Dict[str, Any]:
     """Handle request to cancel an in-progress takeoff safely."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
 
     try:
         result = controller.cancel_takeoff()
@@ -843,7 +732,7 @@ async def handle_set_waypoint_override(conn, override: bool = True) -> Dict[str,
     """Handle set waypoint manual override command."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         controller.set_waypoint_manual_override(override)
@@ -857,7 +746,7 @@ async def handle_fly_to_waypoint(conn, latitude: float, longitude: float, altitu
     """Handle fly to single waypoint command."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         # Validate coordinates
@@ -887,7 +776,7 @@ async def handle_validate_waypoints(conn, waypoints: list) -> Dict[str, Any]:
     """Handle waypoint validation command."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         # Validate waypoints format
@@ -920,7 +809,7 @@ async def handle_calculate_mission_stats(conn, waypoints: list) -> Dict[str, Any
     """Handle mission statistics calculation command."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         if not waypoints or not isinstance(waypoints, list):
@@ -941,7 +830,7 @@ async def handle_generate_grid_mission(conn, start_lat: float, start_lon: float,
     """Handle grid mission generation command."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         # Validate parameters
@@ -971,7 +860,7 @@ async def handle_generate_circular_mission(conn, center_lat: float, center_lon:
     """Handle circular mission generation command."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         # Validate parameters
@@ -1000,7 +889,7 @@ async def handle_waypoint_emergency_response(conn, prompt_id: str, choice: str)
     """Handle user response to waypoint battery emergency prompt."""
     controller = getattr(conn, "controller", None)
     if controller is None:
-        return {"status": "error", "detail": "no controller available"}
+        return _RESP_NO_CONTROLLER
     
     try:
         success = controller.handle_waypoint_emergency_response(prompt_id, choice)
@@ -1027,4 +916,193 @@ COMMAND_HANDLERS.update({
     "generate_circular_mission": handle_generate_circular_mission,
     "waypoint_emergency_response": handle_waypoint_emergency_response,
     "cancel_takeoff": handle_cancel_takeoff,
-})
\ No newline at end of file
+})
+
+
+# =============================================================================
+# COMMAND DISPATCH
+# =============================================================================
+
+def _payload_float(payload: Optional[dict], key: str, default: float) -> float:
+    """Optional float parameter from the payload; raises ValueError/TypeError if malformed."""
+    if payload and key in payload:
+        return float(payload[key])
+    return default
+
+
+async def _run_connect(handler, payload, state):
+    return await handler(state.start_telemetry, state.conn)
+
+
+async def _run_disconnect(handler, payload, state):
+    return await handler(state.stop_telemetry, state.conn)
+
+
+async def _run_reconnect(handler, payload, state):
+    return await handler(state.reconnect_telemetry)
+
+
+async def _run_status(handler, payload, state):
+    return await handler(state.drone_connected)
+
+
+async def _run_conn(handler, payload, state):
+    return await handler(state.conn)
+
+
+async def _run_conn_payload(handler, payload, state):
+    # land/rtl accept a payload for emergency override
+    return await handler(state.conn, payload)
+
+
+async def _run_arm_and_takeoff(handler, payload, state):
+    try:
+        altitude = _payload_float(payload, "altitude", 5.0)
+    except (ValueError, TypeError):
+        return {"status": "error", "detail": "invalid altitude parameter"}
+    return await handler(state.conn, altitude)
+
+
+async def _run_takeoff(handler, payload, state):
+    try:
+        altitude = _payload_float(payload, "altitude", 10.0)
+    except (ValueError, TypeError):
+        return {"status": "error", "detail": "invalid altitude parameter"}
+    return await handler(state.conn, altitude)
+
+
+async def _run_fly_timed(handler, payload, state):
+    # Handle timed flight with altitude and duration parameters
+    altitude = 5.0  # default altitude
+    duration = 5.0  # default duration
+    if payload:
+        # Extract nested payload parameters (fix for parameter extraction bug)
+        nested_payload = payload.get('payload', payload)  # Use nested payload if it exists, otherwise use payload directly
+        try:
+            if "altitude" in nested_payload:
+                altitude = float(nested_payload["altitude"])
+                logger.debug("[COMMAND] Using altitude: %sm", altitude)
+            else:
+                logger.debug("[COMMAND] 'altitude' not found in nested payload")
+            if "duration" in nested_payload:
+                duration = float(nested_payload["duration"])
+                logger.debug("[COMMAND] Using duration: %ss", duration)
+            else:
+                logger.debug("[COMMAND] 'duration' not found in nested payload")
+        except (ValueError, TypeError) as e:
+            logger.error("[COMMAND] Invalid parameter conversion: %s", e)
+            return {"status": "error", "detail": "invalid altitude or duration parameter"}
+    else:
+        logger.debug("[COMMAND] No payload received, using defaults")
+    logger.info("[COMMAND] Final parameters - Altitude: %sm, Duration: %ss", altitude, duration)
+    return await handler(state.conn, altitude, duration, state.broadcast)
+
+
+async def _run_set_throttle(handler, payload, state):
+    try:
+        throttle_percent = _payload_float(payload, "throttle", 0.0)
+    except (ValueError, TypeError):
+        return {"status": "error", "detail": "invalid throttle parameter"}
+    return await handler(state.conn, throttle_percent)
+
+
+async def _run_message(handler, payload, state):
+    return await handler(payload, state.broadcast)
+
+
+async def _run_execute_waypoint_mission(handler, payload, state):
+    # The waypoints are nested in payload.payload
+    inner_payload = payload.get("payload", {}) if payload else {}
+    waypoints = inner_payload.get("waypoints", [])
+    takeoff_altitude = inner_payload.get("takeoff_altitude")
+    # Batching is bound here so the mission code keeps calling a one-argument broadcaster
+    broadcast = functools.partial(state.broadcast, batch_size=MISSION_BROADCAST_BATCH)
+    return await handler(state.conn, waypoints, takeoff_altitude, broadcast)
+
+
+async def _run_set_waypoint_override(handler, payload, state):
+    override = payload.get("override", True) if payload else True
+    return await handler(state.conn, override)
+
+
+async def _run_fly_to_waypoint(handler, payload, state):
+    if not payload:
+        return {"status": "error", "detail": "missing waypoint coordinates"}
+    return await handler(state.conn, payload.get("latitude"), payload.get("longitude"),
+                         payload.get("altitude", 20.0))
+
+
+async def _run_waypoints(handler, payload, state):
+    # validate_waypoints / calculate_mission_stats
+    waypoints = payload.get("waypoints", []) if payload else []
+    return await handler(state.conn, waypoints)
+
+
+async def _run_generate_grid_mission(handler, payload, state):
+    if not payload:
+        return {"status": "error", "detail": "missing grid parameters"}
+    return await handler(
+        state.conn,
+        payload.get("start_lat"),
+        payload.get("start_lon"),
+        payload.get("grid_size", 5),
+        payload.get("spacing", 50.0),
+        payload.get("altitude", 20.0)
+    )
+
+
+async def _run_generate_circular_mission(handler, payload, state):
+    if not payload:
+        return {"status": "error", "detail": "missing circular parameters"}
+    return await handler(
+        state.conn,
+        payload.get("center_lat"),
+        payload.get("center_lon"),
+        payload.get("radius_meters", 100.0),
+        payload.get("num_points", 8),
+        payload.get("altitude", 20.0)
+    )
+
+
+async def _run_waypoint_emergency_response(handler, payload, state):
+    prompt_id = payload.get("prompt_id", "") if payload else ""
+    choice = payload.get("choice", "") if payload else ""
+    return await handler(state.conn, prompt_id, choice)
+
+
+# How each registered command is invoked: one lookup per message instead of
+# walking an if/elif chain
+_COMMAND_RUNNERS = {
+    "connect": _run_connect,
+    "disconnect": _run_disconnect,
+    "reconnect": _run_reconnect,
+    "status": _run_status,
+    "arm": _run_conn,
+    "disarm": _run_conn,
+    "emergency_disarm": _run_conn,
+    "sitl_setup": _run_conn,
+    "mission_status": _run_conn,
+    "release_throttle": _run_conn,
+    "emergency_land": _run_conn,
+    "verify_home": _run_conn,
+    "force_land_here": _run_conn,
+    "land": _run_conn_payload,
+    "rtl": _run_conn_payload,
+    "battery_emergency_response": _run_conn_payload,
+    "arm_and_takeoff": _run_arm_and_takeoff,
+    "takeoff": _run_takeoff,
+    "fly_timed": _run_fly_timed,
+    "set_throttle": _run_set_throttle,
+    "message": _run_message,
+    "execute_waypoint_mission": _run_execute_waypoint_mission,
+    "waypoint_mission_status": _run_conn,
+    "stop_waypoint_mission": _run_conn,
+    "cancel_takeoff": _run_conn,
+    "set_waypoint_override": _run_set_waypoint_override,
+    "fly_to_waypoint": _run_fly_to_waypoint,
+    "validate_waypoints": _run_waypoints,
+    "calculate_mission_stats": _run_waypoints,
+    "generate_grid_mission": _run_generate_grid_mission,
+    "generate_circular_mission": _run_generate_circular_mission,
+    "waypoint_emergency_response": _run_waypoint_emergency_response,
+}
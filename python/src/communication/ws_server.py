@@ -1,48 +1,202 @@
 import asyncio
 import websockets
 import json
+import logging
+import queue
 import sys
 import os
+from logging.handlers import QueueHandler, QueueListener
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional - commands are parsed with the stdlib json module
+    orjson = None
+    _json_loads = json.loads
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional - the default asyncio event loop is used
+    uvloop = None
 
 # Add parent directory to Python path to find modules
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
-from src.core.telemetry_data import TelemetryData
+from src.core.telemetry_data import TelemetryData, encode_telemetry
 from src.core.connection import Connection
 from src.core.controller import Controller
 from config.config import WS_HOST, WS_PORT, DRONE_ID, TELEMETRY_INTERVAL, DEFAULT_CONNECTION_STRING, DEFAULT_BAUD_RATE
 from config.sitl_config import SITLConfig
-from .command_handlers import execute_command
+from .command_handlers import execute_command, CONSTANT_RESPONSES, COMMAND_HANDLERS
+
+def use_fast_event_loop() -> bool:
+    """Run asyncio on uvloop when it is installed. Call before asyncio.run()."""
+    if uvloop is None:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+logger = logging.getLogger('ws_server')
+
+BROADCAST_MAX_CONCURRENCY = 100  # Client sends in flight at once
+BROADCAST_SEND_TIMEOUT_S = 5.0  # A client slower than this is dropped from the broadcast
+BROADCAST_BATCH_SIZE = 50  # Larger fan-outs are sent in batches of this size
+BROADCAST_DIRECT_MAX_BACKLOG = 64 * 1024  # Clients with more unsent bytes than this get awaited sends
+
+# websockets.broadcast() (websockets >= 10) frames a message once and writes it
+# to every connection without awaiting each one
+_ws_broadcast = getattr(websockets, "broadcast", None)
 
-connected_clients = set()
-telemetry_task = None
-conn = None
-drone_connected = False
+class ServerState:
+    """Mutable server state, passed as one object to command execution."""
+
+    __slots__ = ('clients', 'client_snapshot', 'client_count', 'telemetry_task', 'conn', 'drone_connected',
+                 'start_telemetry', 'stop_telemetry', 'reconnect_telemetry', 'broadcast')
+
+    def __init__(self, start_telemetry, stop_telemetry, reconnect_telemetry, broadcast):
+        self.clients = set()
+        self.client_snapshot = ()  # Immutable copy of clients, rebuilt only when it changes
+        self.client_count = 0
+        self.telemetry_task = None
+        self.conn = None
+        self.drone_connected = False
+        # Server operations available to command handlers
+        self.start_telemetry = start_telemetry
+        self.stop_telemetry = stop_telemetry
+        self.reconnect_telemetry = reconnect_telemetry
+        self.broadcast = broadcast
+
+    def refresh_clients(self):
+        self.client_snapshot = tuple(self.clients)
+        self.client_count = len(self.client_snapshot)
+
+_broadcast_sem = None  # Created on first broadcast, inside the running loop
+_closing_clients = set()  # Close tasks for dropped clients, referenced until done
+
+def _client_count_level(count: int) -> int:
+    """INFO for small counts and powers of two, DEBUG otherwise, so reconnect storms don't flood the log."""
+    return logging.INFO if count <= 4 or count & (count - 1) == 0 else logging.DEBUG
 
 async def register_client(ws):
-    connected_clients.add(ws)
-    print(f"Client connected. Total clients: {len(connected_clients)}")
+    state.clients.add(ws)
+    state.refresh_clients()
+    count = state.client_count
+    logger.log(_client_count_level(count), "Client connected. Total clients: %d", count)
 
 async def unregister_client(ws):
-    connected_clients.discard(ws)
-    print(f"Client disconnected. Total clients: {len(connected_clients)}")
+    state.clients.discard(ws)
+    state.refresh_clients()
+    count = state.client_count
+    logger.log(_client_count_level(count), "Client disconnected. Total clients: %d", count)
+
+async def _safe_send(client, message) -> bool:
+    """Send to one client with bounded concurrency and a timeout; False if it failed."""
+    global _broadcast_sem
+    if _broadcast_sem is None:
+        _broadcast_sem = asyncio.Semaphore(BROADCAST_MAX_CONCURRENCY)
+    async with _broadcast_sem:
+        try:
+            await asyncio.wait_for(client.send(message), timeout=BROADCAST_SEND_TIMEOUT_S)
+            return True
+        except asyncio.TimeoutError:
+            # Stuck client - close it so it reconnects instead of stalling broadcasts
+            _close_client(client)
+            return False
+        except websockets.exceptions.ConnectionClosed:
+            return False
+
+def _close_client(client):
+    """Close a client in the background; its ws_handler then unregisters it."""
+    task = asyncio.create_task(client.close())
+    _closing_clients.add(task)
+    task.add_done_callback(_closing_clients.discard)
+
+async def _send_all(clients, message):
+    results = await asyncio.gather(
+        *(_safe_send(client, message) for client in clients),
+        return_exceptions=True
+    )
+    failed = []
+    for client, ok in zip(clients, results):
+        if ok is True:
+            continue
+        if isinstance(ok, BaseException):
+            # Unexpected send error - close the client rather than leave it
+            # connected but cut off from broadcasts
+            logger.warning("Broadcast send to %s failed: %r", getattr(client, "remote_address", client), ok)
+            _close_client(client)
+        failed.append(client)
+    for client in failed:
+        state.clients.discard(client)
+    if failed:
+        state.refresh_clients()
+        logger.warning("Dropped %d client(s) after failed sends. Total clients: %d",
+                       len(failed), state.client_count)
+
+def _split_by_backlog(clients):
+    """(direct, awaited): clients keeping up vs ones with a write backlog or no visible transport."""
+    direct = []
+    awaited = []
+    for client in clients:
+        try:
+            backlog = client.transport.get_write_buffer_size()
+        except AttributeError:
+            awaited.append(client)
+            continue
+        (direct if backlog <= BROADCAST_DIRECT_MAX_BACKLOG else awaited).append(client)
+    return direct, awaited
 
-async def broadcast_to_clients(message: str):
-    if connected_clients:
-        await asyncio.gather(
-            *(client.send(message) for client in connected_clients),
-            return_exceptions=True
-        )
+async def broadcast_to_clients(message, batch_size: int = None):
+    """
+    Send a message to all clients.
+
+    Clients that are keeping up get the frame through websockets.broadcast(),
+    built once and written to each connection. Clients with a write backlog get
+    awaited sends with a timeout instead. With more than batch_size of those
+    (default BROADCAST_BATCH_SIZE) they go out in batches, yielding to the
+    loop between them so telemetry and command handling keep running.
+    """
+    clients = state.client_snapshot
+    if not clients:
+        return
+    if not isinstance(message, (str, bytes)):
+        # Encoded once here and shared by every client send
+        message = encode_telemetry(message)
+    if _ws_broadcast is not None:
+        direct, clients = _split_by_backlog(clients)
+        if direct:
+            _ws_broadcast(direct, message)
+        if not clients:
+            return
+    if batch_size is None:
+        batch_size = BROADCAST_BATCH_SIZE
+    if len(clients) <= batch_size:
+        await _send_all(clients, message)
+        return
+    for i in range(0, len(clients), batch_size):
+        await _send_all(clients[i:i + batch_size], message)
+        await asyncio.sleep(0)
+
+def _offer_latest(queue: asyncio.Queue, frame):
+    """Queue a telemetry frame, replacing one that has not been sent yet."""
+    if queue.full():
+        queue.get_nowait()  # Stale - the newer snapshot supersedes it
+    queue.put_nowait(frame)
+
+async def _telemetry_sender(queue: asyncio.Queue):
+    """Broadcast telemetry frames as they are queued."""
+    while True:
+        frame = await queue.get()
+        await broadcast_to_clients(frame)
 
 async def start_telemetry():
-    global telemetry_task, conn, drone_connected
-    if telemetry_task:
+    if state.telemetry_task:
         print("Telemetry already running")
         return
 
-    conn = Connection()
+    conn = state.conn = Connection()
     connection_string = DEFAULT_CONNECTION_STRING
     baud_rate = DEFAULT_BAUD_RATE
     
@@ -50,7 +204,7 @@ async def start_telemetry():
     connected = await conn.connect(connection_string, baud_rate)
     if not connected or conn.vehicle is None:
         print("Failed to connect to vehicle")
-        drone_connected = False
+        state.drone_connected = False
         return
     try:
         conn.controller = Controller(conn)
@@ -69,84 +223,127 @@ async def start_telemetry():
     except Exception as e:
         print(f"Failed to create controller: {e}")
 
-    drone_connected = True
+    state.drone_connected = True
     print("Telemetry loop started – Drone connected")
 
     telemetry = TelemetryData(conn.vehicle, conn.controller)
 
     async def telemetry_loop():
-        global drone_connected
+        # Sending runs in its own task so a slow client never delays the next
+        # snapshot; at most one unsent frame is kept
+        frames = asyncio.Queue(maxsize=1)
+        sender = asyncio.create_task(_telemetry_sender(frames))
         try:
             while True:
-                data = await telemetry.snapshot()
-                # Create telemetry event and broadcast directly to WebSocket clients
-                event = {
-                    "drone_id": DRONE_ID,
-                    "event_type": "DATA",
-                    "payload": data
-                }
-                await broadcast_to_clients(json.dumps(event))
+                # Nobody to send to - skip building and encoding the snapshot
+                if state.client_snapshot:
+                    data = await telemetry.snapshot()
+                    # Create telemetry event and broadcast directly to WebSocket clients
+                    event = {
+                        "drone_id": DRONE_ID,
+                        "event_type": "DATA",
+                        "payload": data
+                    }
+                    _offer_latest(frames, encode_telemetry(event))
                 await asyncio.sleep(TELEMETRY_INTERVAL)
         except asyncio.CancelledError:
             print("Telemetry loop cancelled")
         finally:
-            drone_connected = False
+            sender.cancel()
+            state.drone_connected = False
             print("Telemetry loop stopped – Drone disconnected")
 
-    telemetry_task = asyncio.create_task(telemetry_loop())
+    state.telemetry_task = asyncio.create_task(telemetry_loop())
 
 async def stop_telemetry():
-    global telemetry_task, conn, drone_connected
-    if telemetry_task:
-        telemetry_task.cancel()
+    if state.telemetry_task:
+        state.telemetry_task.cancel()
         try:
-            await telemetry_task
+            await state.telemetry_task
         except asyncio.CancelledError:
             pass
-        telemetry_task = None
-    if conn:
-        await conn.disconnect()
-        conn = None
-    drone_connected = False
+        state.telemetry_task = None
+    if state.conn:
+        await state.conn.disconnect()
+        state.conn = None
+    state.drone_connected = False
     print("Telemetry stopped – Drone disconnected")
 
 async def reconnect_telemetry():
     await stop_telemetry()
     await start_telemetry()
 
-async def handle_message(message: str, ws) -> None:
-    """Handle incoming message and send appropriate response."""
+state = ServerState(start_telemetry, stop_telemetry, reconnect_telemetry, broadcast_to_clients)
+
+# Encoded text of the shared constant command responses, by object identity
+_CONSTANT_RESPONSE_TEXT = {id(r): encode_telemetry(r) for r in CONSTANT_RESPONSES}
+
+def _encode_response(response: dict, message_id) -> str:
+    """Encode a command response, adding the correlation id if provided."""
+    text = _CONSTANT_RESPONSE_TEXT.get(id(response))
+    if text is None:
+        if message_id is not None:
+            response["id"] = message_id
+        return encode_telemetry(response)
+    if message_id is None:
+        return text
+    # Splice the id into the cached text; the shared dict is left untouched
+    return f'{text[:-1]},"id":{encode_telemetry(message_id)}}}'
+
+def _build_fast_commands():
+    """
+    Exact messages that need no JSON parsing, mapped to (command_type, is_json).
+
+    Covers bare legacy command words (as forwarded by the Node backend) and
+    parameterless {"type": ...} objects, as text and as bytes.
+    """
+    fast = {}
+    for name in COMMAND_HANDLERS:
+        for text, is_json in ((name, False), (f'{{"type":"{name}"}}', True), (f'{{"type": "{name}"}}', True)):
+            fast[text] = fast[text.encode()] = (name, is_json)
+    return fast
+
+_FAST_COMMANDS = _build_fast_commands()
+
+async def handle_message(message, ws) -> None:
+    """
+    Handle incoming message and send appropriate response.
+
+    JSON commands may arrive as text or binary frames; binary frames are
+    parsed as-is, skipping the UTF-8 decode to str.
+    """
     
+    fast = _FAST_COMMANDS.get(message)
+    if fast is not None:
+        command_type, is_json = fast
+        payload = {"type": command_type} if is_json else None
+        message_id = None
+    else:
+        command_type, payload, message_id = _parse_command(message)
+    
+    # Execute command using the command handler
+    response = await execute_command(command_type, payload, state)
+    
+    # Send response, with the message ID if provided for correlation
+    if response:
+        await ws.send(_encode_response(response, message_id))
+
+
+def _parse_command(message):
+    """(command_type, payload, message_id) from a JSON or legacy text command."""
     # Try to parse as JSON first
     try:
-        payload = json.loads(message)
+        payload = _json_loads(message)
         command_type = str(payload.get("type", "")).lower()
         message_id = payload.get("id")
-    except json.JSONDecodeError:
+    except (json.JSONDecodeError, UnicodeDecodeError):  # orjson's decode error subclasses the former
         # Legacy text command
+        if isinstance(message, bytes):
+            message = message.decode("utf-8", "ignore")
         command_type = message.lower()
         payload = None
         message_id = None
-    
-    # Execute command using the command handler
-    response = await execute_command(
-        command_type=command_type,
-        payload=payload,
-        conn=conn,
-        drone_connected=drone_connected,
-        start_telemetry_func=start_telemetry,
-        stop_telemetry_func=stop_telemetry,
-        reconnect_telemetry_func=reconnect_telemetry,
-        broadcast_func=broadcast_to_clients
-    )
-    
-    # Add message ID if provided for correlation
-    if message_id is not None and response:
-        response["id"] = message_id
-    
-    # Send response
-    if response:
-        await ws.send(json.dumps(response))
+    return command_type, payload, message_id
 
 
 async def ws_handler(ws):
@@ -158,8 +355,34 @@ async def ws_handler(ws):
         await unregister_client(ws)
 
 
+def _start_queued_logging():
+    """
+    Move the root log handlers onto a background thread.
+
+    Records are queued by the event loop and formatted/written by a
+    QueueListener, so log I/O never blocks the loop. Returns the listener,
+    or None if there was nothing to move.
+    """
+    root = logging.getLogger()
+    handlers = [h for h in root.handlers if not isinstance(h, QueueHandler)]
+    if not handlers or len(handlers) != len(root.handlers):
+        return None
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    root.handlers = [QueueHandler(log_queue)]
+    listener.start()
+    return listener
+
+def _stop_queued_logging(listener):
+    """Flush queued records and give the root logger its handlers back."""
+    if listener is None:
+        return
+    listener.stop()
+    logging.getLogger().handlers = list(listener.handlers)
+
 async def start_ws_server():
     server = await websockets.serve(ws_handler, WS_HOST, WS_PORT)
+    log_listener = _start_queued_logging()
     print(f"Python WS server running at ws://{WS_HOST}:{WS_PORT}")
 
     try:
@@ -170,9 +393,12 @@ async def start_ws_server():
         server.close()
         await server.wait_closed()
         print("Server shutdown complete.")
+        _stop_queued_logging(log_listener)
 
 
 if __name__ == "__main__":
+    if use_fast_event_loop():
+        print("Using uvloop event loop")
     try:
         asyncio.run(start_ws_server())
     except KeyboardInterrupt:
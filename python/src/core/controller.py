@@ -1,5 +1,5 @@
 import asyncio
-import json
+import itertools
 import time
 import logging
 from datetime import datetime, timedelta
@@ -32,9 +32,11 @@ class Controller:
         self.flight_start_time = None
         self.home_location = None
         self.current_mission = None
+        self._mission_start_monotonic = None  # time.monotonic() when current_mission started
         
         # Emergency state tracking
         self.emergency_prompts = {}
+        self._prompt_seq = itertools.count().__next__  # Unique prompt_id suffixes
         
         # Start monitoring task
         asyncio.create_task(self._monitor_flight_safety())
@@ -140,9 +142,9 @@ class Controller:
             return False
 
     async def _wait_for_condition(self, check_fn, timeout, interval=0.5, desc="condition"):
-        start = time.time()
+        deadline_ns = time.monotonic_ns() + int(timeout * 1e9)
         while not check_fn():
-            if time.time() - start > timeout:
+            if time.monotonic_ns() > deadline_ns:
                 print(f"Timed out waiting for {desc}.")
                 return False
             await asyncio.sleep(interval)
@@ -470,7 +472,7 @@ class Controller:
             
             # Real-time altitude tracking with progress updates
             print(f"[TAKEOFF] Climbing to {altitude}m...")
-            start_time = time.time()
+            deadline_ns = time.monotonic_ns() + int(wait_timeout * 1e9)
             last_logged_meter = -1
             
             while True:
@@ -500,7 +502,7 @@ class Controller:
                     return True
                 
                 # Check timeout
-                if time.time() - start_time > wait_timeout:
+                if time.monotonic_ns() > deadline_ns:
                     print(f"[TAKEOFF] TIMEOUT - Current: {current_alt:.1f}m, Target: {altitude}m")
                     return False
                 
@@ -556,7 +558,7 @@ class Controller:
             print("[LAND] Descending...")
             
             # Real-time descent tracking
-            start_time = time.time()
+            deadline_ns = time.monotonic_ns() + int(wait_timeout * 1e9)
             last_logged_alt = current_alt
             
             while True:
@@ -574,7 +576,7 @@ class Controller:
                     return True
                 
                 # Check timeout
-                if time.time() - start_time > wait_timeout:
+                if time.monotonic_ns() > deadline_ns:
                     print(f"[LAND] TIMEOUT - Still at {current_alt:.1f}m")
                     return False
                 
@@ -617,13 +619,15 @@ class Controller:
             print("[RTL] Returning to launch point...")
             
             # Track RTL progress with periodic updates
-            start_time = time.time()
+            start_ns = time.monotonic_ns()
+            deadline_ns = start_ns + int(wait_timeout * 1e9)
             last_update = 0
             
             while True:
                 current_alt = getattr(vehicle.location.global_relative_frame, "alt", 0) if vehicle.location.global_relative_frame else 0
                 armed = getattr(vehicle, "armed", False)
-                elapsed = time.time() - start_time
+                now_ns = time.monotonic_ns()
+                elapsed = (now_ns - start_ns) / 1e9
                 
                 # Log progress every 10 seconds
                 if elapsed - last_update >= 10:
@@ -636,7 +640,7 @@ class Controller:
                     return True
                 
                 # Check timeout
-                if elapsed > wait_timeout:
+                if now_ns > deadline_ns:
                     print(f"[RTL] TIMEOUT - Still returning after {elapsed:.0f}s")
                     return False
                 
@@ -687,6 +691,7 @@ class Controller:
                 "start_time": datetime.now(),
                 "end_time": datetime.now() + timedelta(seconds=duration)
             }
+            self._mission_start_monotonic = time.monotonic()
             
             # Step 1: Takeoff to target altitude
             if not await self.takeoff(altitude):
@@ -695,11 +700,11 @@ class Controller:
                 
             # Step 2: Hold position for specified duration with battery monitoring
             print(f"[MISSION] Holding position for {duration} seconds")
-            mission_start = datetime.now()
+            mission_start = time.monotonic()
             last_log_time = 0
             battery_emergency_triggered = False
             
-            while (datetime.now() - mission_start).total_seconds() < duration:
+            while time.monotonic() - mission_start < duration:
                 # Monitor vehicle status during mission
                 if not getattr(vehicle, "armed", False):
                     print("[MISSION] INTERRUPTED - Vehicle disarmed")
@@ -724,7 +729,7 @@ class Controller:
                     return emergency_result.startswith(('rtl', 'land', 'timeout_rtl'))
                     
                 current_alt = getattr(vehicle.location.global_relative_frame, "alt", 0) if vehicle.location.global_relative_frame else 0
-                elapsed = (datetime.now() - mission_start).total_seconds()
+                elapsed = time.monotonic() - mission_start
                 remaining_time = duration - elapsed
                 
                 # Log every 10 seconds
@@ -889,9 +894,8 @@ class Controller:
         if not self.current_mission:
             return None
             
-        now = datetime.now()
-        elapsed = (now - self.current_mission["start_time"]).total_seconds()
-        remaining = max(0, (self.current_mission["end_time"] - now).total_seconds())
+        elapsed = time.monotonic() - self._mission_start_monotonic
+        remaining = max(0, self.current_mission["duration"] - elapsed)
         
         return {
             **self.current_mission,
@@ -950,7 +954,7 @@ class Controller:
         print(f"💡 Recommendation: {recommendation} ({reason})")
         
         # Send emergency prompt to frontend
-        prompt_id = f"battery_emergency_{int(time.time() * 1000)}"  # Use milliseconds for uniqueness
+        prompt_id = f"battery_emergency_{self._prompt_seq()}"
         emergency_data = {
             "type": "battery_emergency",
             "prompt_id": prompt_id,
@@ -964,7 +968,7 @@ class Controller:
         }
         
         print(f"🚨 Broadcasting emergency prompt with ID: {prompt_id}")
-        await broadcast_func(json.dumps(emergency_data))
+        await broadcast_func(emergency_data)
         
         # Wait for user response with 10-second timeout
         import asyncio
@@ -977,19 +981,20 @@ class Controller:
         # Store the emergency state for response handling
         if not hasattr(self, '_emergency_prompts'):
             self._emergency_prompts = {}
-        self._emergency_prompts[prompt_id] = {
+        entry = {
             "start_time": start_time,
             "timeout": timeout_seconds,
             "response": None
         }
+        self._emergency_prompts[prompt_id] = entry
         
         print(f"🚨 Waiting for user response to prompt {prompt_id} (timeout: {timeout_seconds}s)")
         
         # Countdown and wait for response
         while (datetime.now() - start_time).total_seconds() < timeout_seconds:
             # Check if user responded
-            if prompt_id in self._emergency_prompts and self._emergency_prompts[prompt_id]["response"]:
-                user_choice = self._emergency_prompts[prompt_id]["response"]
+            if entry["response"]:
+                user_choice = entry["response"]
                 print(f"✅ User responded with: {user_choice}")
                 break
                 
@@ -1000,25 +1005,25 @@ class Controller:
                 "prompt_id": prompt_id,
                 "remaining_seconds": max(0, remaining)
             }
-            await broadcast_func(json.dumps(countdown_data))
+            await broadcast_func(countdown_data)
             
             await asyncio.sleep(0.5)  # Check every 500ms
         
         # Execute chosen action
         if user_choice == "LAND":
             print("🚨 User chose EMERGENCY LAND - executing immediate landing")
-            await broadcast_func(json.dumps({"type": "battery_emergency_action", "action": "LAND"}))
+            await broadcast_func({"type": "battery_emergency_action", "action": "LAND"})
             success = await self.land(force_land_here=True, emergency_override=True)
             return "land" if success else "land_failed"
         elif user_choice == "RTL":
             print("🚨 User chose RTL - executing return to launch")
-            await broadcast_func(json.dumps({"type": "battery_emergency_action", "action": "RTL"}))
+            await broadcast_func({"type": "battery_emergency_action", "action": "RTL"})
             success = await self.rtl(emergency_override=True)
             return "rtl" if success else "rtl_failed"
         else:
             # Timeout - use default RTL
             print(f"⏰ No user response in {timeout_seconds}s - defaulting to RTL")
-            await broadcast_func(json.dumps({"type": "battery_emergency_action", "action": "RTL_TIMEOUT"}))
+            await broadcast_func({"type": "battery_emergency_action", "action": "RTL_TIMEOUT"})
             success = await self.rtl(emergency_override=True)
             return "timeout_rtl" if success else "timeout_rtl_failed"
     
@@ -1030,7 +1035,8 @@ class Controller:
             print(f"❌ No emergency prompts tracking available")
             return False
             
-        if prompt_id not in self._emergency_prompts:
+        entry = self._emergency_prompts.get(prompt_id)
+        if entry is None:
             print(f"❌ Prompt ID {prompt_id} not found. Available prompts: {list(self._emergency_prompts.keys())}")
             # Don't return False immediately - the user might have responded after timeout
             # but we should still log their choice for future reference
@@ -1042,19 +1048,18 @@ class Controller:
             return False
         
         # Check if prompt has already been responded to
-        if self._emergency_prompts[prompt_id]["response"]:
-            print(f"⚠️ Prompt {prompt_id} already has response: {self._emergency_prompts[prompt_id]['response']}")
+        if entry["response"]:
+            print(f"⚠️ Prompt {prompt_id} already has response: {entry['response']}")
             return False
             
-        self._emergency_prompts[prompt_id]["response"] = choice
+        entry["response"] = choice
         print(f"✅ Emergency response received and recorded: {choice}")
         
         # Clean up the prompt after successful response (delayed cleanup)
         import asyncio
         async def cleanup_prompt():
             await asyncio.sleep(2)  
-            if prompt_id in self._emergency_prompts:
-                del self._emergency_prompts[prompt_id]
+            if self._emergency_prompts.pop(prompt_id, None) is not None:
                 print(f"🧹 Cleaned up prompt {prompt_id}")
         
         # Schedule cleanup but don't wait for it
@@ -1,39 +1,166 @@
-from datetime import datetime
+import json
+import operator
+import sys
+import time
+
+from ..navigation.navigation_utils import NavigationUtils
+
+try:
+    import msgspec
+    _json_encoder = msgspec.json.Encoder()
+except ImportError:  # msgspec is optional - falls back to orjson, then the stdlib json module
+    msgspec = None
+    _json_encoder = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+# Reused output buffer for msgspec; telemetry is only encoded on the event loop
+_encode_buffer = bytearray(4096)
+
+# Vehicle attributes read on every snapshot, in unpacking order. Resolved
+# through C-level attrgetters; a missing attribute reads as None.
+_VEHICLE_FIELDS = (
+    "location.global_relative_frame", "location.global_frame",
+    "attitude", "velocity", "gps_0", "battery", "armed", "mode.name",
+    "heading", "groundspeed", "airspeed", "climb_rate", "rc_channels",
+    "last_heartbeat", "system_status", "home_location",
+    "flight_time", "last_status", "ekf_ok",
+)
+_VEHICLE_GETTERS = tuple(operator.attrgetter(path) for path in _VEHICLE_FIELDS)
+
+# JSON keys for RC channels 1-16, looked up by int or str channel number
+_RC_KEYS = {key: str(i) for i in range(1, 17) for key in (i, str(i))}
+
+
+def encode_telemetry(event) -> str:
+    """Encode a telemetry event or command response as JSON text."""
+    # Frames stay text (str): clients expect text WebSocket messages
+    try:
+        if _json_encoder is not None:
+            _json_encoder.encode_into(event, _encode_buffer)
+            return _encode_buffer.decode()
+        if orjson is not None:
+            return orjson.dumps(event, option=orjson.OPT_NON_STR_KEYS).decode()
+    except TypeError:
+        pass  # A type the fast encoder doesn't support - let json handle it
+    return json.dumps(event)
+
+
+# Seconds-resolution ISO prefix, rebuilt only when the wall-clock second changes
+_last_sec = -1
+_last_prefix = ""
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time as ISO-8601 with microseconds and a 'Z' suffix."""
+    global _last_sec, _last_prefix
+    ns = time.time_ns()
+    sec, frac = divmod(ns, 1_000_000_000)
+    if sec != _last_sec:
+        _last_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _last_sec = sec
+    return f"{_last_prefix}.{frac // 1000:06d}Z"
+
+
+# str(vehicle.system_status) by state name. DroneKit builds a new SystemStatus
+# object on every read, so the key is its state rather than the object.
+_SYSTEM_STATUS_STR = {}
+
+
+def _system_status_str(system_status):
+    state = getattr(system_status, "state", None)
+    if state is None:
+        return str(system_status)
+    text = _SYSTEM_STATUS_STR.get(state)
+    if text is None:
+        text = _SYSTEM_STATUS_STR[state] = sys.intern(str(system_status))
+    return text
+
+
+def _round_number(val, ndigits):
+    # Generic path: ints, bools and float subclasses are rounded as floats
+    if isinstance(val, (float, int)):
+        try:
+            return round(float(val), ndigits)
+        except Exception:
+            return val
+    return val
+
+
+def _fmt(val):
+    # Support both float and int values for rounding general numbers.
+    # Plain floats and None are nearly every call, so they skip the generic path.
+    if type(val) is float:
+        return round(val, 2)
+    if val is None:
+        return None
+    return _round_number(val, 2)
+
+
+def _fmt_coord(val):
+    # Format GPS coordinates with higher precision to avoid marker drift
+    if type(val) is float:
+        return round(val, 6)
+    if val is None:
+        return None
+    return _round_number(val, 6)
+
 
 class TelemetryData:
+    __slots__ = ('vehicle', 'controller', '_home_cache_key', '_home_cache_val')
+
     def __init__(self, vehicle, controller=None):
         self.vehicle = vehicle
         self.controller = controller
+        # Home only changes on arm/set-home, so its payload is rebuilt on change
+        self._home_cache_key = None
+        self._home_cache_val = {"lat": 0.0, "lon": 0.0, "alt": 0.0}
+
+    def _read_vehicle(self):
+        """Read every field in _VEHICLE_FIELDS from the vehicle in one pass."""
+        vehicle = self.vehicle
+        values = []
+        append = values.append
+        for getter in _VEHICLE_GETTERS:
+            try:
+                append(getter(vehicle))
+            except AttributeError:
+                append(None)
+        return values
+
+    def _home_position(self, home):
+        """Serialized home position, reused while the home coordinates are unchanged."""
+        if not home:
+            key = None
+        else:
+            _g = getattr
+            key = (_g(home, "lat", 0.0), _g(home, "lon", 0.0), _g(home, "alt", _g(home, "altitude", 0.0)))
+        if key != self._home_cache_key:
+            if key is None:
+                self._home_cache_val = {"lat": 0.0, "lon": 0.0, "alt": 0.0}
+            else:
+                self._home_cache_val = {
+                    "lat": _fmt_coord(key[0]),
+                    "lon": _fmt_coord(key[1]),
+                    "alt": _fmt(key[2])
+                }
+            self._home_cache_key = key
+        return self._home_cache_val
 
     async def snapshot(self):
         if self.vehicle is None:
             return None
 
-        loc_rel = getattr(self.vehicle.location, "global_relative_frame", None)
-        loc_global = getattr(self.vehicle.location, "global_frame", None)
-        att = getattr(self.vehicle, "attitude", None)
-        vel = getattr(self.vehicle, "velocity", None)
-        gps = getattr(self.vehicle, "gps_0", None)
-        bat = getattr(self.vehicle, "battery", None)
-        armed = getattr(self.vehicle, "armed", None)
-        mode = getattr(self.vehicle.mode, "name", None)
-        heading = getattr(self.vehicle, "heading", None)
-        gs = getattr(self.vehicle, "groundspeed", None)
-        aspeed = getattr(self.vehicle, "airspeed", None)
-        vz = getattr(self.vehicle, "climb_rate", None)
-        rc_channels = getattr(self.vehicle, "rc_channels", None)
-        last_heartbeat = getattr(self.vehicle, "last_heartbeat", None)
-        system_status = getattr(self.vehicle, "system_status", None)
-        home = getattr(self.vehicle, "home_location", None)
+        (loc_rel, loc_global, att, vel, gps, bat, armed, mode, heading, gs,
+         aspeed, vz, rc_channels, last_heartbeat, system_status, home,
+         flight_time, status_text, ekf_ok) = self._read_vehicle()
         # Check if home location is actually set (not just None)
         if home and (home.lat == 0.0 and home.lon == 0.0):
             home = None  # Treat 0,0 as unset home location
 
-        # Optional fields
-        flight_time = getattr(self.vehicle, "flight_time", None)
-        status_text = getattr(self.vehicle, "last_status", None)
-
-        ekf_ok = getattr(self.vehicle, "ekf_ok", None)
         # ekf_variances = {
         #     "pos_horiz": getattr(self.vehicle, "pos_horiz_variance", None),
         #     "pos_vert": getattr(self.vehicle, "pos_vert_variance", None),
@@ -43,39 +170,32 @@ class TelemetryData:
         #     "terrain_alt": getattr(self.vehicle, "terrain_alt_variance", None)
         # }
 
-        def fmt(val):
-            # Support both float and int values for rounding general numbers.
-            if isinstance(val, (float, int)):
-                try:
-                    return round(float(val), 2)
-                except Exception:
-                    return val
-            return val
+        fmt = _fmt
+        fmt_coord = _fmt_coord
+        _g = getattr
 
-        def fmt_coord(val):
-            # Format GPS coordinates with higher precision to avoid marker drift
-            if isinstance(val, (float, int)):
-                try:
-                    return round(float(val), 6)
-                except Exception:
-                    return val
-            return val
+        loc = loc_rel or loc_global
+        alt_rel = fmt(_g(loc_rel, "alt", None)) if loc_rel else None
+        alt_global = fmt(_g(loc_global, "alt", None)) if loc_global else None
+        eph = _g(gps, "eph", None) if gps else None
+        epv = _g(gps, "epv", None) if gps else None
 
         rc_data = None
         if rc_channels:
             try:
-                rc_data = {str(k): fmt(v) for k, v in rc_channels.items()}
+                rc_key = _RC_KEYS.get
+                rc_data = {rc_key(k) or str(k): fmt(v) for k, v in rc_channels.items()}
             except Exception:
                 rc_data = str(rc_channels) 
 
         data = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _utc_timestamp(),
             "location": {
-                "lat": fmt_coord((loc_rel or loc_global).lat) if (loc_rel or loc_global) else None,
-                "lon": fmt_coord((loc_rel or loc_global).lon) if (loc_rel or loc_global) else None,
-                "alt": fmt(loc_rel.alt) if loc_rel and hasattr(loc_rel, "alt") else (fmt(loc_global.alt) if loc_global and hasattr(loc_global, "alt") else None),
-                "alt_rel": fmt(loc_rel.alt) if loc_rel and hasattr(loc_rel, "alt") else None,
-                "alt_global": fmt(loc_global.alt) if loc_global and hasattr(loc_global, "alt") else None,
+                "lat": fmt_coord(loc.lat) if loc else None,
+                "lon": fmt_coord(loc.lon) if loc else None,
+                "alt": alt_rel if loc_rel else alt_global,
+                "alt_rel": alt_rel,
+                "alt_global": alt_global,
             },
             "attitude": {
                 "roll": fmt(att.roll) if att else None,
@@ -95,19 +215,15 @@ class TelemetryData:
             "gps": {
                 "satellites_visible": gps.satellites_visible if gps else None,
                 "fix_type": gps.fix_type if gps else None,
-                "eph": fmt(gps.eph) if gps and hasattr(gps, "eph") else None,
-                "epv": fmt(gps.epv) if gps and hasattr(gps, "epv") else None
+                "eph": fmt(eph),
+                "epv": fmt(epv)
             },
             "heading": heading if heading else None,
             "groundspeed": fmt(gs) if gs else None,
             "airspeed": fmt(aspeed) if aspeed is not None else 0.0,
             "climb_rate": fmt(vz) if vz is not None else 0.0,
             "rc_channels": rc_data if rc_data is not None else {},
-            "home_position": {
-                "lat": fmt_coord(home.lat) if home and hasattr(home, "lat") else 0.0,
-                "lon": fmt_coord(home.lon) if home and hasattr(home, "lon") else 0.0,  
-                "alt": fmt(getattr(home, "alt", getattr(home, "altitude", 0.0))) if home else 0.0
-            },
+            "home_position": self._home_position(home),
             "flight_time": fmt(flight_time) if flight_time is not None else 0.0,
             "status_text": status_text if status_text is not None else "",
             "ekf": {
@@ -117,7 +233,7 @@ class TelemetryData:
             "armed": armed,
             "mode": mode,
             "last_heartbeat": fmt(last_heartbeat) if last_heartbeat else None,
-            "system_status": str(system_status)
+            "system_status": _system_status_str(system_status)
         }
 
         # Add distance to waypoint if available
@@ -129,12 +245,11 @@ class TelemetryData:
                     current_mission.current_waypoint_index < len(current_mission.waypoints)):
                     
                     current_wp = current_mission.waypoints[current_mission.current_waypoint_index]
-                    if loc_rel or loc_global:
-                        current_lat = (loc_rel or loc_global).lat
-                        current_lon = (loc_rel or loc_global).lon
+                    if loc:
+                        current_lat = loc.lat
+                        current_lon = loc.lon
                         
                         # Calculate distance using NavigationUtils
-                        from ..navigation.navigation_utils import NavigationUtils
                         distance_to_waypoint = NavigationUtils.calculate_distance(
                             (current_lat, current_lon),
                             (current_wp[0], current_wp[1])  # waypoint is (lat, lon, alt)
@@ -163,13 +278,23 @@ class TelemetryData:
         return data
 
     def print_stats(self, data, indent=0):
-        pad = "  " * indent
-        if isinstance(data, dict):
-            for k, v in data.items():
+        """Print nested telemetry as an indented tree in a single stdout write."""
+        if not isinstance(data, dict):
+            sys.stdout.write(f"{'  ' * indent}{data}\n")
+            return
+        lines = []
+        stack = [(iter(data.items()), indent)]
+        while stack:
+            items, depth = stack[-1]
+            for k, v in items:
+                pad = "  " * depth
                 if isinstance(v, dict):
-                    print(f"{pad}{k}:")
-                    self.print_stats(v, indent + 1)
-                else:
-                    print(f"{pad}{k}: {v}")
-        else:
-            print(f"{pad}{data}")
+                    lines.append(f"{pad}{k}:")
+                    stack.append((iter(v.items()), depth + 1))
+                    break
+                lines.append(f"{pad}{k}: {v}")
+            else:
+                stack.pop()
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
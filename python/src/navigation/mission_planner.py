@@ -7,14 +7,24 @@ A utility to plan and validate waypoint missions before execution.
 
 import json
 import math
+import functools
 from typing import List, Tuple, Dict, Any
 
+
+@functools.lru_cache(maxsize=4096)
+def _segment_distance_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Haversine leg length in meters, memoized across summary/validation passes."""
+    from .navigation_utils import NavigationUtils
+    return NavigationUtils.calculate_distance_scalar(lat1, lon1, lat2, lon2)
+
+
 class MissionPlanner:
     """Utility for planning and validating waypoint missions."""
     
     def __init__(self):
         self.waypoints = []
         self.mission_stats = {}
+        self._stats_key = None  # Waypoints mission_stats was computed for
     
     def add_waypoint(self, lat: float, lon: float, alt: float = 20.0) -> bool:
         """Add a waypoint to the mission."""
@@ -47,15 +57,19 @@ class MissionPlanner:
     
     def calculate_distance(self, wp1: Tuple[float, float, float], wp2: Tuple[float, float, float]) -> float:
         """Calculate distance between two waypoints using NavigationUtils."""
-        from .navigation_utils import NavigationUtils
-        return NavigationUtils.calculate_distance(wp1[:2], wp2[:2])
+        return _segment_distance_m(wp1[0], wp1[1], wp2[0], wp2[1])
     
     def calculate_mission_stats(self) -> Dict[str, Any]:
-        """Calculate mission statistics using MissionCalculator."""
+        """Calculate mission statistics using MissionCalculator (reused while waypoints are unchanged)."""
         from .navigation_utils import MissionCalculator
         
+        key = tuple(tuple(wp) for wp in self.waypoints)
+        if key == self._stats_key:
+            return self.mission_stats
+        
         stats = MissionCalculator.calculate_mission_stats(self.waypoints)
         self.mission_stats = stats
+        self._stats_key = key
         return stats
     
     def validate_mission(self) -> Tuple[bool, List[str]]:
@@ -69,24 +83,25 @@ class MissionPlanner:
         if len(self.waypoints) < 2:
             issues.append("Need at least 2 waypoints for a mission")
         
-        # Check for waypoints too close together
-        if len(self.waypoints) > 1:
-            for i in range(len(self.waypoints) - 1):
-                distance = self.calculate_distance(self.waypoints[i], self.waypoints[i + 1])
-                if distance < 2.0:
-                    issues.append(f"Waypoints {i+1} and {i+2} are too close ({distance:.1f}m)")
+        # Check for waypoints too close together (legs come from the
+        # memoized _segment_distance_m shared with the summary)
+        legs = zip(self.waypoints, self.waypoints[1:])
+        for i, (wp1, wp2) in enumerate(legs):
+            distance = self.calculate_distance(wp1, wp2)
+            if distance < 2.0:
+                issues.append(f"Waypoints {i+1} and {i+2} are too close ({distance:.1f}m)")
         
         # Check mission distance
         stats = self.calculate_mission_stats()
-        if stats["total_distance"] > 1000:  # 1km limit
-            issues.append(f"Mission too long ({stats['total_distance']:.0f}m > 1000m)")
+        if stats["total_distance_m"] > 1000:  # 1km limit
+            issues.append(f"Mission too long ({stats['total_distance_m']:.0f}m > 1000m)")
         
         # Check flight time
-        if stats["estimated_flight_time"] > 600:  # 10 minute limit
-            issues.append(f"Flight time too long ({stats['estimated_flight_time']:.0f}s > 600s)")
+        if stats["estimated_flight_time_s"] > 600:  # 10 minute limit
+            issues.append(f"Flight time too long ({stats['estimated_flight_time_s']:.0f}s > 600s)")
         
         # Check altitude consistency
-        if stats["altitude_range"][1] - stats["altitude_range"][0] > 30:
+        if stats["altitude_range_m"][1] - stats["altitude_range_m"][0] > 30:
             issues.append("Large altitude variations (>30m) detected")
         
         return len(issues) == 0, issues
@@ -102,9 +117,9 @@ class MissionPlanner:
         print("\n🗺️ Mission Summary")
         print("=" * 40)
         print(f"📍 Waypoints: {stats['total_waypoints']}")
-        print(f"📏 Total distance: {stats['total_distance']:.0f}m")
-        print(f"⏱️ Estimated flight time: {stats['estimated_flight_time']:.0f}s ({stats['estimated_flight_time']/60:.1f} min)")
-        print(f"📈 Altitude range: {stats['altitude_range'][0]:.1f}m - {stats['altitude_range'][1]:.1f}m")
+        print(f"📏 Total distance: {stats['total_distance_m']:.0f}m")
+        print(f"⏱️ Estimated flight time: {stats['estimated_flight_time_s']:.0f}s ({stats['estimated_flight_time_s']/60:.1f} min)")
+        print(f"📈 Altitude range: {stats['altitude_range_m'][0]:.1f}m - {stats['altitude_range_m'][1]:.1f}m")
         
         if stats['bounding_box']:
             bb = stats['bounding_box']
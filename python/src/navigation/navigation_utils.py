@@ -10,6 +10,13 @@ waypoint validation functions to eliminate code duplication.
 import math
 from typing import List, Tuple, Dict, Any, Optional
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional - mission stats fall back to scalar Haversine
+    np = None
+
+from . import wp_kernel
+
 
 class NavigationUtils:
     """Centralized navigation and GPS calculation utilities."""
@@ -55,44 +62,23 @@ class NavigationUtils:
         if not wp1 or not wp2 or len(wp1) < 2 or len(wp2) < 2:
             return float('inf')
         
+        return NavigationUtils.calculate_distance_scalar(wp1[0], wp1[1], wp2[0], wp2[1])
+    
+    @staticmethod
+    def calculate_distance_scalar(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+        """
+        Haversine distance taking flat scalar arguments.
+        
+        Same semantics as calculate_distance without building coordinate
+        tuples, for use in per-tick monitor loops. The Haversine itself runs
+        in wp_kernel, JIT-compiled when Numba is installed.
+        
+        Returns:
+            Distance in meters, or float('inf') if calculation fails
+        """
         try:
-            lat1, lon1 = float(wp1[0]), float(wp1[1])
-            lat2, lon2 = float(wp2[0]), float(wp2[1])
-            
-            # Validate coordinates
-            valid1, _ = NavigationUtils.validate_coordinates(lat1, lon1)
-            valid2, _ = NavigationUtils.validate_coordinates(lat2, lon2)
-            
-            if not valid1 or not valid2:
-                return float('inf')
-            
-            # Handle identical coordinates
-            if lat1 == lat2 and lon1 == lon2:
-                return 0.0
-            
-            # Haversine formula
-            lat1_rad = math.radians(lat1)
-            lat2_rad = math.radians(lat2)
-            delta_lat = math.radians(lat2 - lat1)
-            delta_lon = math.radians(lon2 - lon1)
-            
-            a = (math.sin(delta_lat/2)**2 + 
-                 math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon/2)**2)
-            
-            # Handle numerical errors
-            if a > 1.0:
-                a = 1.0
-            
-            c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-            distance = NavigationUtils.EARTH_RADIUS_M * c
-            
-            # Sanity check
-            if distance < 0 or distance > NavigationUtils.MAX_REALISTIC_DISTANCE:
-                return float('inf')
-            
-            return distance
-            
-        except (ValueError, TypeError, ZeroDivisionError):
+            return wp_kernel.haversine(float(lat1), float(lon1), float(lat2), float(lon2))
+        except (ValueError, TypeError):
             return float('inf')
     
     @staticmethod
@@ -248,12 +234,64 @@ class WaypointValidator:
 class MissionCalculator:
     """Mission statistics and planning calculations."""
     
+    @staticmethod
+    def _leg_distances_np(waypoints: List[Tuple[float, float, float]]):
+        """Vectorized Haversine over all mission legs (requires NumPy)."""
+        coords = np.asarray([wp[:2] for wp in waypoints], dtype=float)
+        lat = np.radians(coords[:, 0])
+        lon = np.radians(coords[:, 1])
+        
+        a = (np.sin(np.diff(lat) / 2) ** 2 +
+             np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(np.diff(lon) / 2) ** 2)
+        legs = 2 * NavigationUtils.EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+        
+        # Legs touching an out-of-range coordinate are inf, matching
+        # calculate_distance on the scalar path
+        lat_deg, lon_deg = coords[:, 0], coords[:, 1]
+        valid = (np.abs(lat_deg) <= 90.0) & (np.abs(lon_deg) <= 180.0)
+        legs[~(valid[:-1] & valid[1:])] = np.inf
+        return legs
+    
+    @staticmethod
+    def _total_distance_np(waypoints: List[Tuple[float, float, float]]) -> float:
+        """Sum of the finite vectorized leg distances (requires NumPy)."""
+        legs = MissionCalculator._leg_distances_np(waypoints)
+        return float(legs[np.isfinite(legs)].sum())
+    
+    @staticmethod
+    def leg_distances(waypoints: List[Tuple[float, float, float]]) -> List[float]:
+        """Distance of each consecutive waypoint leg in meters (inf for invalid legs)."""
+        if len(waypoints) < 2:
+            return []
+        
+        if np is not None:
+            try:
+                return MissionCalculator._leg_distances_np(waypoints).tolist()
+            except (ValueError, TypeError, IndexError):
+                pass  # Malformed input - fall back to the scalar path
+        
+        return [NavigationUtils.calculate_distance(a[:2], b[:2])
+                for a, b in zip(waypoints, waypoints[1:])]
+    
+    @staticmethod
+    def _altitude_change(waypoints: List[Tuple[float, float, float]]) -> float:
+        """Sum of absolute altitude changes between consecutive waypoints."""
+        if np is not None:
+            return float(np.abs(np.diff(np.asarray([wp[2] for wp in waypoints], dtype=float))).sum())
+        return sum(abs(waypoints[i+1][2] - waypoints[i][2]) for i in range(len(waypoints) - 1))
+    
     @staticmethod
     def calculate_total_distance(waypoints: List[Tuple[float, float, float]]) -> float:
         """Calculate total mission distance."""
         if len(waypoints) < 2:
             return 0.0
         
+        if np is not None:
+            try:
+                return MissionCalculator._total_distance_np(waypoints)
+            except (ValueError, TypeError, IndexError):
+                pass  # Malformed input - let the scalar path skip bad legs
+        
         total = 0.0
         for i in range(len(waypoints) - 1):
             distance = NavigationUtils.calculate_distance(waypoints[i][:2], waypoints[i+1][:2])
@@ -264,17 +302,18 @@ class MissionCalculator:
     
     @staticmethod
     def estimate_flight_time(waypoints: List[Tuple[float, float, float]], 
-                           speed_ms: float = 5.0) -> float:
-        """Estimate mission flight time in seconds."""
-        distance = MissionCalculator.calculate_total_distance(waypoints)
+                           speed_ms: float = 5.0, distance: Optional[float] = None) -> float:
+        """Estimate mission flight time in seconds.
+        
+        A precomputed total distance can be passed to avoid recomputing the legs.
+        """
+        if distance is None:
+            distance = MissionCalculator.calculate_total_distance(waypoints)
         if distance == 0:
             return 0.0
         
         # Add time for altitude changes (assume 2 m/s climb rate)
-        altitude_changes = 0.0
-        for i in range(len(waypoints) - 1):
-            alt_diff = abs(waypoints[i+1][2] - waypoints[i][2])
-            altitude_changes += alt_diff / 2.0  # 2 m/s climb rate
+        altitude_changes = MissionCalculator._altitude_change(waypoints) / 2.0
         
         travel_time = distance / speed_ms
         total_time = travel_time + altitude_changes
@@ -311,10 +350,11 @@ class MissionCalculator:
     @staticmethod
     def calculate_mission_stats(waypoints: List[Tuple[float, float, float]]) -> Dict[str, Any]:
         """Calculate comprehensive mission statistics."""
+        total_distance = MissionCalculator.calculate_total_distance(waypoints)
         return {
             "total_waypoints": len(waypoints),
-            "total_distance_m": MissionCalculator.calculate_total_distance(waypoints),
-            "estimated_flight_time_s": MissionCalculator.estimate_flight_time(waypoints),
+            "total_distance_m": total_distance,
+            "estimated_flight_time_s": MissionCalculator.estimate_flight_time(waypoints, distance=total_distance),
             "altitude_range_m": MissionCalculator.get_altitude_range(waypoints),
             "bounding_box": MissionCalculator.get_bounding_box(waypoints),
             "is_valid": len(WaypointValidator.validate_waypoint_list(waypoints)[1]) == 0
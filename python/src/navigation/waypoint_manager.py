@@ -8,36 +8,106 @@ handling during waypoint navigation.
 """
 
 import asyncio
+import itertools
+import sys
 import time
 from typing import List, Tuple, Dict, Any, Optional, Callable
 from datetime import datetime
 from dronekit import VehicleMode, LocationGlobalRelative
 from config.config import WaypointConfig, FlightLogger
 from .navigation_utils import NavigationUtils, WaypointValidator, MissionCalculator
-from ..safety.flight_safety import FlightSafetyManager
+from . import wp_kernel
+from ..safety.flight_safety import FlightSafetyManager, format_emergency
+
+
+# Emergency codes reported by check_emergency_conditions that should
+# trigger the battery emergency protocol.
+_BATTERY_EMERGENCY_CODES = frozenset({
+    'CRITICAL_BATTERY_LEVEL',
+    'LOW_BATTERY_LEVEL',
+    'CRITICAL_BATTERY_VOLTAGE',
+})
+
+# Broadcast message types where only the newest of a run is worth sending.
+_COALESCED_BROADCAST_TYPES = frozenset({'waypoint_progress', 'takeoff_progress'})
+_BROADCAST_QUEUE_SIZE = 64
+_BROADCAST_STOP = object()  # Sentinel that ends the broadcast worker
+
+# Flight log events are queued during a mission and written in batches
+_LOG_QUEUE_SIZE = 4096
+_LOG_FLUSH_INTERVAL_S = 0.05
+_LOG_STOP = object()  # Sentinel that ends the log worker
+
+# Constant parts of the battery emergency prompt sent to clients
+_EMERGENCY_PROMPT_TEMPLATE = {
+    'type': 'emergency_prompt',
+    'options': ('RTL', 'LAND'),
+    'timeout': WaypointConfig.EMERGENCY_RESPONSE_TIMEOUT
+}
+_EMERGENCY_MSG_FMT = 'BATTERY EMERGENCY: {}% remaining. Choose action:'.format
+
+# Minimum spacing between in-flight emergency condition checks (seconds)
+_EMERGENCY_CHECK_INTERVAL_S = 0.5
+
+# Per-waypoint console banner, written to stdout in a single call
+_WP_HEADER_TPL = (
+    "[MISSION] ═══ WAYPOINT {i}/{n} ═══\n"
+    "[MISSION] Current Position: {lat:.6f}, {lon:.6f}\n"
+    "[MISSION] Current Altitude: {alt:.1f}m\n"
+    "[MISSION] Target Position: {target_lat:.6f}, {target_lon:.6f}\n"
+    "[MISSION] Target Altitude: {target_alt:.1f}m\n"
+    "[MISSION] Distance to Waypoint: {distance:.1f}m\n"
+    "[MISSION] Drone Speed: {speed:.1f}m/s\n"
+    "[MISSION] Drone Mode: {mode}\n"
+)
 
 
 class WaypointMission:
     """Represents a waypoint mission with metadata."""
     
+    __slots__ = ('mission_id', 'waypoints', 'created_at', '_status',
+                 '_current_waypoint_index', 'stats', '_cached_dict')
+    
     def __init__(self, waypoints: List[Tuple[float, float, float]], mission_id: str = None):
+        self._cached_dict = None
         self.mission_id = mission_id or f"mission_{int(time.time())}"
         self.waypoints = waypoints
         self.created_at = datetime.now()
         self.status = "CREATED"  # CREATED, VALIDATED, ACTIVE, COMPLETED, ABORTED
         self.current_waypoint_index = 0
         self.stats = MissionCalculator.calculate_mission_stats(waypoints)
+    
+    # Progress fields invalidate the cached to_dict() result when written
+    @property
+    def status(self) -> str:
+        return self._status
+    
+    @status.setter
+    def status(self, value: str):
+        self._status = value
+        self._cached_dict = None
+    
+    @property
+    def current_waypoint_index(self) -> int:
+        return self._current_waypoint_index
+    
+    @current_waypoint_index.setter
+    def current_waypoint_index(self, value: int):
+        self._current_waypoint_index = value
+        self._cached_dict = None
         
     def to_dict(self) -> Dict[str, Any]:
-        """Convert mission to dictionary representation."""
-        return {
-            'mission_id': self.mission_id,
-            'waypoints': self.waypoints,
-            'created_at': self.created_at.isoformat(),
-            'status': self.status,
-            'current_waypoint': self.current_waypoint_index,
-            'stats': self.stats
-        }
+        """Convert mission to dictionary representation (cached; treat as read-only)."""
+        if self._cached_dict is None:
+            self._cached_dict = {
+                'mission_id': self.mission_id,
+                'waypoints': self.waypoints,
+                'created_at': self.created_at.isoformat(),
+                'status': self._status,
+                'current_waypoint': self._current_waypoint_index,
+                'stats': self.stats
+            }
+        return self._cached_dict
 
 
 class WaypointMissionManager:
@@ -50,12 +120,35 @@ class WaypointMissionManager:
         
         # Mission state
         self.current_mission: Optional[WaypointMission] = None
-        self.mission_start_time: Optional[datetime] = None
+        self.mission_start_time: Optional[float] = None  # time.monotonic() at mission start
         self.emergency_prompts = {}  # Track active emergency prompts
+        self._prompt_seq = itertools.count().__next__  # Unique prompt_id suffixes
+        # Emergency action -> safety manager procedure
+        self._emergency_handlers = {
+            'RTL': self.safety_manager.handle_emergency_rtl,
+            'LAND': self.safety_manager.handle_emergency_landing,
+        }
+        
+        # Outgoing broadcasts are queued and sent by a writer task so the
+        # navigation loop never awaits the WebSocket
+        self._bcast_q: Optional[asyncio.Queue] = None
+        self._bcast_task: Optional[asyncio.Task] = None
+        
+        # Flight log events are likewise handed to a writer task during a
+        # mission so file I/O stays off the control path
+        self._log_q: Optional[asyncio.Queue] = None
+        self._log_task: Optional[asyncio.Task] = None
         
         # Mission settings
         self.waypoint_tolerance = 2.0  # meters
         self.max_waypoint_time = 120.0  # seconds per waypoint
+        self._last_emerg_check = 0.0  # time.monotonic() of the last in-flight emergency check
+        self._abort_event = asyncio.Event()  # Set by abort_mission to wake the monitor loop
+        
+        # Post-mission behaviour is static configuration - resolve it once
+        self._auto_rtl = bool(WaypointConfig.AUTO_RTL_ON_MISSION_COMPLETE)
+        self._post_mission_action = WaypointConfig.POST_MISSION_ACTION.upper()
+        self._inter_waypoint_pause = getattr(WaypointConfig, 'INTER_WAYPOINT_PAUSE_S', 0.2)
         
     def _get_current_position_log(self) -> Dict[str, Any]:
         """Get detailed current position and status for logging."""
@@ -80,6 +173,139 @@ class WaypointMissionManager:
                 'error': str(e), 'timestamp': datetime.now().isoformat()
             }
         
+    async def _wait_for_takeoff_altitude(self, vehicle, takeoff_altitude: float, timeout: float) -> bool:
+        """Wait for 95% of takeoff altitude via a location listener. Returns False on timeout."""
+        target_alt = takeoff_altitude * 0.95
+        loop = asyncio.get_running_loop()
+        reached = asyncio.Event()
+        
+        def on_location(_vehicle, _name, frame):
+            # Invoked on dronekit's MAVLink thread
+            if getattr(frame, 'alt', None) is not None and frame.alt >= target_alt:
+                loop.call_soon_threadsafe(reached.set)
+        
+        vehicle.add_attribute_listener('location.global_relative_frame', on_location)
+        try:
+            # The listener only fires on updates, so check where we already are
+            if (getattr(vehicle.location.global_relative_frame, 'alt', 0) or 0) >= target_alt:
+                return True
+            await asyncio.wait_for(reached.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            vehicle.remove_attribute_listener('location.global_relative_frame', on_location)
+
+    async def _wait_next_tick(self, interval: float) -> None:
+        """Sleep up to interval, returning early if the mission is aborted."""
+        try:
+            await asyncio.wait_for(self._abort_event.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+    
+    def _start_broadcast_worker(self, broadcast_func: Optional[Callable]):
+        """Start the writer task that drains queued broadcasts for a mission."""
+        if not broadcast_func:
+            return
+        self._bcast_q = asyncio.Queue(maxsize=_BROADCAST_QUEUE_SIZE)
+        self._bcast_task = asyncio.create_task(self._broadcast_worker(self._bcast_q, broadcast_func))
+    
+    async def _stop_broadcast_worker(self):
+        """Flush queued broadcasts and stop the writer task."""
+        task, queue = self._bcast_task, self._bcast_q
+        self._bcast_task = None
+        self._bcast_q = None
+        if task is None:
+            return
+        try:
+            await asyncio.wait_for(queue.put(_BROADCAST_STOP), timeout=2.0)
+            await asyncio.wait_for(task, timeout=5.0)
+        except asyncio.TimeoutError:
+            task.cancel()
+    
+    def _broadcast(self, message: Dict[str, Any]):
+        """Queue a broadcast without blocking; dropped if no writer or queue full."""
+        if self._bcast_q is None:
+            return
+        try:
+            self._bcast_q.put_nowait(message)
+        except asyncio.QueueFull:
+            print(f"[WAYPOINT_MANAGER] Broadcast queue full - dropped {message.get('type')}")
+    
+    @staticmethod
+    async def _broadcast_worker(queue: asyncio.Queue, broadcast_func: Callable):
+        """Send queued broadcasts, collapsing consecutive progress updates."""
+        pending = None
+        while True:
+            if pending is not None:
+                message, pending = pending, None
+            else:
+                message = await queue.get()
+            if message is _BROADCAST_STOP:
+                return
+            
+            key = (message.get('type'), message.get('status'))
+            if key[0] in _COALESCED_BROADCAST_TYPES:
+                while not queue.empty():
+                    nxt = queue.get_nowait()
+                    if nxt is not _BROADCAST_STOP and (nxt.get('type'), nxt.get('status')) == key:
+                        message = nxt
+                    else:
+                        pending = nxt
+                        break
+            
+            try:
+                await broadcast_func(message)
+            except Exception as e:
+                print(f"[WAYPOINT_MANAGER] Broadcast error: {e}")
+    
+    def _start_log_worker(self):
+        """Start the writer task that drains queued flight log events for a mission."""
+        self._log_q = asyncio.Queue(maxsize=_LOG_QUEUE_SIZE)
+        self._log_task = asyncio.create_task(self._log_worker(self._log_q, self.flight_logger))
+    
+    async def _stop_log_worker(self):
+        """Flush queued log events and stop the writer task."""
+        task, queue = self._log_task, self._log_q
+        self._log_task = None
+        self._log_q = None
+        if task is None:
+            return
+        try:
+            await asyncio.wait_for(queue.put(_LOG_STOP), timeout=2.0)
+            await asyncio.wait_for(task, timeout=5.0)
+        except asyncio.TimeoutError:
+            task.cancel()
+    
+    def _log_event(self, event_type: str, data: Dict[str, Any]):
+        """Queue a flight log event; written directly when no writer is running or the queue is full."""
+        if self._log_q is not None:
+            try:
+                self._log_q.put_nowait((event_type, data))
+                return
+            except asyncio.QueueFull:
+                pass
+        self.flight_logger.log_event(event_type, data)
+    
+    @staticmethod
+    async def _log_worker(queue: asyncio.Queue, flight_logger: FlightLogger):
+        """Write queued log events in batches."""
+        while True:
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            stop = batch[-1] is _LOG_STOP
+            if stop:
+                batch.pop()
+            try:
+                flight_logger.log_events(batch)
+            except Exception as e:
+                print(f"[WAYPOINT_MANAGER] Log write error: {e}")
+            if stop:
+                return
+            await asyncio.sleep(_LOG_FLUSH_INTERVAL_S)
+    
     async def execute_mission(self, waypoints: List[Tuple[float, float, float]], 
                             takeoff_altitude: Optional[float] = None,
                             broadcast_func: Optional[Callable] = None) -> Dict[str, Any]:
@@ -113,15 +339,19 @@ class WaypointMissionManager:
         # Create mission
         mission = WaypointMission(processed_waypoints)
         self.current_mission = mission
-        self.mission_start_time = datetime.now()
+        self.mission_start_time = time.monotonic()
         
-        self.flight_logger.log_event('mission_started', {
+        self._log_event('mission_started', {
             'mission_id': mission.mission_id,
             'waypoint_count': len(processed_waypoints),
             'total_distance': mission.stats['total_distance_m'],
             'estimated_time': mission.stats['estimated_flight_time_s']
         })
         
+        self._abort_event.clear()
+        self._start_log_worker()
+        self._start_broadcast_worker(broadcast_func)
+        
         try:
             # Pre-flight safety check
             if not self.safety_manager.validate_vehicle_ready(self.connection):
@@ -131,38 +361,13 @@ class WaypointMissionManager:
                     'mission_id': mission.mission_id
                 }
 
-            # Battery and GPS validation checks
+            # Battery and GPS validation checks - one snapshot of the vehicle
+            # serves the pre-flight gates, the takeoff decision and the
+            # navigation start log.
             vehicle = self.connection.vehicle
-            try:
-                battery_level = getattr(vehicle.battery, 'level', 0) if hasattr(vehicle, 'battery') and vehicle.battery else 0
-                satellites = getattr(vehicle.gps_0, 'satellites_visible', 0) if hasattr(vehicle, 'gps_0') and vehicle.gps_0 else 0
-                
-                # Battery check - minimum 25%
-                if battery_level < 25:
-                    error_msg = f"❌ Battery too low: {battery_level}% - Cannot set waypoints (minimum 25% required)"
-                    print(f"[MISSION] {error_msg}")
-                    return {
-                        'success': False,
-                        'error': error_msg,
-                        'mission_id': mission.mission_id,
-                        'battery_level': battery_level
-                    }
-                
-                # GPS check - minimum 6 satellites
-                if satellites < 6:
-                    error_msg = f"❌ GPS insufficient: {satellites} satellites - Cannot set waypoints (minimum 6 satellites required)"
-                    print(f"[MISSION] {error_msg}")
-                    return {
-                        'success': False,
-                        'error': error_msg,
-                        'mission_id': mission.mission_id,
-                        'satellites': satellites
-                    }
-                
-                print(f"[MISSION] ✅ Pre-flight validation passed - Battery: {battery_level}%, GPS: {satellites} satellites")
-                
-            except Exception as e:
-                error_msg = f"❌ Failed to check battery/GPS status: {str(e)}"
+            snapshot = self._get_current_position_log()
+            if 'error' in snapshot:
+                error_msg = f"❌ Failed to check battery/GPS status: {snapshot['error']}"
                 print(f"[MISSION] {error_msg}")
                 return {
                     'success': False,
@@ -170,40 +375,62 @@ class WaypointMissionManager:
                     'mission_id': mission.mission_id
                 }
 
+            battery_level = snapshot['battery'] or 0
+            satellites = snapshot['satellites'] or 0
+
+            # Battery check - minimum 25%
+            if battery_level < 25:
+                error_msg = f"❌ Battery too low: {battery_level}% - Cannot set waypoints (minimum 25% required)"
+                print(f"[MISSION] {error_msg}")
+                return {
+                    'success': False,
+                    'error': error_msg,
+                    'mission_id': mission.mission_id,
+                    'battery_level': battery_level
+                }
+
+            # GPS check - minimum 6 satellites
+            if satellites < 6:
+                error_msg = f"❌ GPS insufficient: {satellites} satellites - Cannot set waypoints (minimum 6 satellites required)"
+                print(f"[MISSION] {error_msg}")
+                return {
+                    'success': False,
+                    'error': error_msg,
+                    'mission_id': mission.mission_id,
+                    'satellites': satellites
+                }
+
+            print(f"[MISSION] ✅ Pre-flight validation passed - Battery: {battery_level}%, GPS: {satellites} satellites")
+
             # If a takeoff_altitude is provided and vehicle is not already armed/airborne,
             # perform an automatic arm-and-takeoff to the requested altitude.
-            vehicle = self.connection.vehicle
-            try:
-                is_armed = getattr(vehicle, 'armed', False)
-                current_alt = getattr(vehicle.location.global_relative_frame, 'alt', 0) if vehicle.location and getattr(vehicle, 'location', None) else 0
-            except Exception:
-                is_armed = False
-                current_alt = 0
+            is_armed = snapshot['armed']
+            current_alt = snapshot['alt'] or 0
+            took_off = False
 
             if takeoff_altitude is not None:
                 # Only attempt arm-and-takeoff if vehicle is not already armed or not above a small altitude
                 if not is_armed or current_alt < 1.5:
+                    took_off = True
                     # Use controller's arm_and_takeoff if available on connection.controller
                     controller = getattr(self.connection, 'controller', None)
                     if controller and hasattr(controller, 'arm_and_takeoff'):
-                        self.flight_logger.log_event('auto_takeoff_initiated', {'altitude': takeoff_altitude, 'mission_id': mission.mission_id})
+                        self._log_event('auto_takeoff_initiated', {'altitude': takeoff_altitude, 'mission_id': mission.mission_id})
                         # Broadcast takeoff started
-                        if broadcast_func:
-                            await broadcast_func({'type': 'takeoff_progress', 'status': 'started', 'target_altitude': takeoff_altitude, 'mission_id': mission.mission_id})
+                        self._broadcast({'type': 'takeoff_progress', 'status': 'started', 'target_altitude': takeoff_altitude, 'mission_id': mission.mission_id})
 
                         # Await controller arm and takeoff while sending periodic progress updates
                         async def _progress_cb(current_alt, target_alt):
                             try:
-                                if broadcast_func:
-                                    percent = min(100, int((current_alt / target_alt) * 100)) if target_alt and target_alt > 0 else 0
-                                    await broadcast_func({
-                                        'type': 'takeoff_progress',
-                                        'status': 'progress',
-                                        'current_altitude': current_alt,
-                                        'target_altitude': target_alt,
-                                        'percent': percent,
-                                        'mission_id': mission.mission_id
-                                    })
+                                percent = min(100, int((current_alt / target_alt) * 100)) if target_alt and target_alt > 0 else 0
+                                self._broadcast({
+                                    'type': 'takeoff_progress',
+                                    'status': 'progress',
+                                    'current_altitude': current_alt,
+                                    'target_altitude': target_alt,
+                                    'percent': percent,
+                                    'mission_id': mission.mission_id
+                                })
                             except Exception as e:
                                 # Don't fail takeoff due to progress broadcast issues
                                 print(f"[WAYPOINT_MANAGER] Takeoff progress broadcast error: {e}")
@@ -212,11 +439,9 @@ class WaypointMissionManager:
 
                         # Broadcast completion or failure
                         if ok:
-                            if broadcast_func:
-                                await broadcast_func({'type': 'takeoff_progress', 'status': 'completed', 'target_altitude': takeoff_altitude, 'mission_id': mission.mission_id})
+                            self._broadcast({'type': 'takeoff_progress', 'status': 'completed', 'target_altitude': takeoff_altitude, 'mission_id': mission.mission_id})
                         else:
-                            if broadcast_func:
-                                await broadcast_func({'type': 'takeoff_progress', 'status': 'failed', 'target_altitude': takeoff_altitude, 'mission_id': mission.mission_id})
+                            self._broadcast({'type': 'takeoff_progress', 'status': 'failed', 'target_altitude': takeoff_altitude, 'mission_id': mission.mission_id})
                             return {
                                 'success': False,
                                 'error': 'Auto takeoff failed',
@@ -225,20 +450,14 @@ class WaypointMissionManager:
                     else:
                         try:
                             vehicle.simple_takeoff(takeoff_altitude)
-                            # Wait until altitude reached or timeout
-                            start = time.time()
-                            timeout = 30
-                            while True:
-                                alt = getattr(vehicle.location.global_relative_frame, 'alt', 0)
-                                if alt >= takeoff_altitude * 0.95:
-                                    break
-                                if time.time() - start > timeout:
-                                    return {
-                                        'success': False,
-                                        'error': 'Auto takeoff timeout',
-                                        'mission_id': mission.mission_id
-                                    }
-                                await asyncio.sleep(0.5)
+                            # Wait until altitude reached or timeout, woken by
+                            # dronekit location updates instead of polling
+                            if not await self._wait_for_takeoff_altitude(vehicle, takeoff_altitude, timeout=30):
+                                return {
+                                    'success': False,
+                                    'error': 'Auto takeoff timeout',
+                                    'mission_id': mission.mission_id
+                                }
                         except Exception as e:
                             return {
                                 'success': False,
@@ -249,10 +468,13 @@ class WaypointMissionManager:
             # Execute waypoints
             mission.status = "ACTIVE"
             # print(f"[MISSION] Starting waypoint navigation - {len(processed_waypoints)} waypoints total")
-            self.flight_logger.log_event('waypoint_navigation_started', {
+            if took_off:
+                # The pre-flight snapshot is stale once the vehicle has climbed
+                snapshot = self._get_current_position_log()
+            self._log_event('waypoint_navigation_started', {
                 'mission_id': mission.mission_id,
                 'total_waypoints': len(processed_waypoints),
-                'initial_position': self._get_current_position_log()
+                'initial_position': snapshot
             })
             
             for i, waypoint in enumerate(processed_waypoints):
@@ -260,21 +482,20 @@ class WaypointMissionManager:
                 lat, lon, alt = waypoint
                 
                 # Log detailed waypoint start info
-                current_pos = self._get_current_position_log()
-                distance_to_wp = NavigationUtils.calculate_distance(
-                    (current_pos['lat'], current_pos['lon']), (lat, lon)
+                current_pos = snapshot if i == 0 else self._get_current_position_log()
+                distance_to_wp = NavigationUtils.calculate_distance_scalar(
+                    current_pos['lat'], current_pos['lon'], lat, lon
                 ) if current_pos['lat'] != 0 else 0
                 
-                print(f"[MISSION] ═══ WAYPOINT {i+1}/{len(processed_waypoints)} ═══")
-                print(f"[MISSION] Current Position: {current_pos['lat']:.6f}, {current_pos['lon']:.6f}")
-                print(f"[MISSION] Current Altitude: {current_pos['alt']:.1f}m")
-                print(f"[MISSION] Target Position: {lat:.6f}, {lon:.6f}")
-                print(f"[MISSION] Target Altitude: {alt:.1f}m")
-                print(f"[MISSION] Distance to Waypoint: {distance_to_wp:.1f}m")
-                print(f"[MISSION] Drone Speed: {current_pos['speed']:.1f}m/s")
-                print(f"[MISSION] Drone Mode: {current_pos['mode']}")
+                sys.stdout.write(_WP_HEADER_TPL.format_map({
+                    'i': i + 1, 'n': len(processed_waypoints),
+                    'lat': current_pos['lat'], 'lon': current_pos['lon'], 'alt': current_pos['alt'],
+                    'target_lat': lat, 'target_lon': lon, 'target_alt': alt,
+                    'distance': distance_to_wp,
+                    'speed': current_pos['speed'], 'mode': current_pos['mode']
+                }))
                 
-                self.flight_logger.log_event('waypoint_navigation_start', {
+                self._log_event('waypoint_navigation_start', {
                     'mission_id': mission.mission_id,
                     'waypoint_number': i + 1,
                     'total_waypoints': len(processed_waypoints),
@@ -284,16 +505,15 @@ class WaypointMissionManager:
                 })
                 
                 # Broadcast current waypoint
-                if broadcast_func:
-                    await broadcast_func({
-                        'type': 'waypoint_progress',
-                        'mission_id': mission.mission_id,
-                        'current_waypoint': i + 1,
-                        'total_waypoints': len(processed_waypoints),
-                        'waypoint': waypoint,
-                        'current_position': current_pos,
-                        'distance_to_target': distance_to_wp
-                    })
+                self._broadcast({
+                    'type': 'waypoint_progress',
+                    'mission_id': mission.mission_id,
+                    'current_waypoint': i + 1,
+                    'total_waypoints': len(processed_waypoints),
+                    'waypoint': waypoint,
+                    'current_position': current_pos,
+                    'distance_to_target': distance_to_wp
+                })
                 
                 # Execute single waypoint
                 result = await self._execute_waypoint(waypoint, i + 1, len(processed_waypoints), broadcast_func)
@@ -309,7 +529,7 @@ class WaypointMissionManager:
             
             # Mission completed successfully - comprehensive logging
             mission.status = "COMPLETED"
-            total_mission_time = (datetime.now() - self.mission_start_time).total_seconds()
+            total_mission_time = time.monotonic() - self.mission_start_time
             final_position = self._get_current_position_log()
             
             print(f"[MISSION] ═══════════════════════════════════════")
@@ -325,7 +545,7 @@ class WaypointMissionManager:
             print(f"[MISSION] Average Mission Speed: {mission.stats.get('total_distance_m', 0) / total_mission_time:.1f}m/s")
             print(f"[MISSION] ═══════════════════════════════════════")
             
-            self.flight_logger.log_event('mission_completed', {
+            self._log_event('mission_completed', {
                 'mission_id': mission.mission_id,
                 'waypoints_completed': len(processed_waypoints),
                 'total_time': total_mission_time,
@@ -339,13 +559,13 @@ class WaypointMissionManager:
             })
             
             # Post-mission action based on configuration
-            if WaypointConfig.AUTO_RTL_ON_MISSION_COMPLETE:
+            if self._auto_rtl:
                 try:
                     controller = getattr(self.connection, 'controller', None)
-                    action = WaypointConfig.POST_MISSION_ACTION.upper()
+                    action = self._post_mission_action
                     
                     if controller and action != "NONE":
-                        self.flight_logger.log_event('post_mission_action', {
+                        self._log_event('post_mission_action', {
                             'mission_id': mission.mission_id, 
                             'action': action,
                             'reason': 'mission_complete'
@@ -353,14 +573,13 @@ class WaypointMissionManager:
                         print(f"[POST-MISSION] 🏠 Initiating {action} - All waypoints completed")
                         print(f"[POST-MISSION] Current Position: {final_position['lat']:.6f}, {final_position['lon']:.6f}, {final_position['alt']:.1f}m")
                         
-                        if broadcast_func:
-                            await broadcast_func({
-                                'type': 'mission_complete',
-                                'mission_id': mission.mission_id,
-                                'action': action,
-                                'message': f'All waypoints completed - performing {action}',
-                                'final_position': final_position
-                            })
+                        self._broadcast({
+                            'type': 'mission_complete',
+                            'mission_id': mission.mission_id,
+                            'action': action,
+                            'message': f'All waypoints completed - performing {action}',
+                            'final_position': final_position
+                        })
                         
                         # Perform the configured action with detailed logging
                         if action == "RTL" and hasattr(controller, 'rtl'):
@@ -392,29 +611,44 @@ class WaypointMissionManager:
             }
             
         except Exception as e:
+            msg = str(e)
             if mission:
                 mission.status = "ABORTED"
             
-            self.flight_logger.log_event('mission_error', {
+            self._log_event('mission_error', {
                 'mission_id': mission.mission_id if mission else 'unknown',
-                'error': str(e)
+                'error': msg
             })
             
             return {
                 'success': False,
-                'error': f'Mission execution error: {str(e)}',
+                'error': f'Mission execution error: {msg}',
                 'mission_id': mission.mission_id if mission else None
             }
+        
+        finally:
+            await self._stop_broadcast_worker()
+            await self._stop_log_worker()
     
     async def _execute_waypoint(self, waypoint: Tuple[float, float, float], 
                                wp_num: int, total_wp: int,
                                broadcast_func: Optional[Callable] = None) -> Dict[str, Any]:
         """Execute a single waypoint with safety monitoring."""
         lat, lon, alt = waypoint
+        # Loop invariants for the monitor loop below
+        tol = self.waypoint_tolerance
+        max_t = self.max_waypoint_time
+        log = self._log_event
+        log_progress = self.flight_logger.would_log('waypoint_progress_update')
+        safety_manager = self.safety_manager
+        check_emerg = safety_manager.check_emergency_conditions
+        distance_to = NavigationUtils.calculate_distance_scalar
+        check_wp = wp_kernel.check_waypoint
+        progress_percent = wp_kernel.progress_percent
         
         print(f"[WAYPOINT-{wp_num}] Starting execution to {lat:.6f}, {lon:.6f}, {alt:.1f}m")
         
-        self.flight_logger.log_event('waypoint_started', {
+        self._log_event('waypoint_started', {
             'waypoint_number': wp_num,
             'coordinates': waypoint,
             'detailed_status': self._get_current_position_log()
@@ -427,11 +661,12 @@ class WaypointMissionManager:
             # Pre-waypoint safety checks
             print(f"[WAYPOINT-{wp_num}] Pre-flight safety check - Battery: {start_pos['battery']}%, GPS: {start_pos['satellites']} sats")
             
-            emergencies = self.safety_manager.check_emergency_conditions(vehicle)
+            emergencies = check_emerg(vehicle)
+            self._last_emerg_check = time.monotonic()
             if emergencies:
-                print(f"[WAYPOINT-{wp_num}] ⚠️ EMERGENCY DETECTED: {emergencies}")
+                print(f"[WAYPOINT-{wp_num}] ⚠️ EMERGENCY DETECTED: {[format_emergency(*e) for e in emergencies]}")
                 # Handle battery emergency during waypoint navigation
-                battery_emergencies = [e for e in emergencies if 'BATTERY' in e]
+                battery_emergencies = [e for e in emergencies if e[0] in _BATTERY_EMERGENCY_CODES]
                 if battery_emergencies:
                     print(f"[WAYPOINT-{wp_num}] 🚨 BATTERY EMERGENCY: Initiating emergency protocol")
                     action = await self._handle_waypoint_battery_emergency(
@@ -441,14 +676,14 @@ class WaypointMissionManager:
                         return {
                             'success': False,
                             'error': f'Emergency action taken: {action}',
-                            'emergency': battery_emergencies[0]
+                            'emergency': format_emergency(*battery_emergencies[0])
                         }
             
             # Log mode switch to GUIDED if needed
             current_mode = getattr(vehicle.mode, 'name', 'UNKNOWN') if hasattr(vehicle, 'mode') else 'UNKNOWN'
             if current_mode != 'GUIDED':
                 print(f"[WAYPOINT-{wp_num}] Mode switch: {current_mode} → GUIDED")
-                self.flight_logger.log_event('mode_change', {
+                self._log_event('mode_change', {
                     'from_mode': current_mode,
                     'to_mode': 'GUIDED',
                     'reason': f'waypoint_{wp_num}_navigation'
@@ -462,7 +697,7 @@ class WaypointMissionManager:
             
             vehicle.simple_goto(target_location)
             
-            self.flight_logger.log_event('navigation_command_sent', {
+            self._log_event('navigation_command_sent', {
                 'waypoint_number': wp_num,
                 'from_position': start_pos,
                 'to_position': {'lat': lat, 'lon': lon, 'alt': alt},
@@ -470,22 +705,32 @@ class WaypointMissionManager:
             })
             
             # Monitor waypoint approach with detailed logging
-            start_time = time.time()
+            start_time = time.monotonic()
             last_log_time = 0
             last_distance = None
             last_altitude = None
+            inv_initial_dist = None  # 1 / distance at first tick, for progress percent
             
             print(f"[WAYPOINT-{wp_num}] 🚁 Monitoring navigation progress...")
             
             while True:
-                current_time = time.time()
+                if self._abort_event.is_set():
+                    print(f"[WAYPOINT-{wp_num}] ⛔ Mission aborted")
+                    return {
+                        'success': False,
+                        'error': 'Mission aborted'
+                    }
+                
+                current_time = time.monotonic()
                 elapsed = current_time - start_time
                 
                 # Get detailed current status
                 current_status = self._get_current_position_log()
-                current_pos = (current_status['lat'], current_status['lon'])
-                target_pos = (lat, lon)
-                distance = NavigationUtils.calculate_distance(current_pos, target_pos)
+                reached, timed_out, distance = check_wp(
+                    current_status['lat'], current_status['lon'], lat, lon, elapsed, tol, max_t
+                )
+                if inv_initial_dist is None and distance != float('inf'):
+                    inv_initial_dist = 1.0 / distance if distance > 0 else 0.0
                 
                 # Log progress every 2 seconds or significant changes
                 should_log = (
@@ -501,28 +746,30 @@ class WaypointMissionManager:
                     #       f"Mode: {current_status['mode']} | "
                     #       f"Time: {elapsed:.1f}s")
                     
-                    self.flight_logger.log_event('waypoint_progress_update', {
-                        'waypoint_number': wp_num,
-                        'distance_remaining': distance,
-                        'current_status': current_status,
-                        'elapsed_time': elapsed,
-                        'progress_percent': max(0, min(100, (1 - distance/100) * 100)) 
-                    })
+                    if log_progress:
+                        pct = progress_percent(distance, inv_initial_dist) if inv_initial_dist is not None else 0
+                        log('waypoint_progress_update', {
+                            'waypoint_number': wp_num,
+                            'distance_remaining': distance,
+                            'current_status': current_status,
+                            'elapsed_time': elapsed,
+                            'progress_percent': pct
+                        })
                     
                     last_log_time = elapsed
                     last_distance = distance
                     last_altitude = current_status['alt']
                 
                 # Check timeout
-                if elapsed > self.max_waypoint_time:
-                    print(f"[WAYPOINT-{wp_num}] ❌ TIMEOUT after {self.max_waypoint_time}s - Distance remaining: {distance:.1f}m")
+                if timed_out:
+                    print(f"[WAYPOINT-{wp_num}] ❌ TIMEOUT after {max_t}s - Distance remaining: {distance:.1f}m")
                     return {
                         'success': False,
-                        'error': f'Waypoint timeout after {self.max_waypoint_time}s'
+                        'error': f'Waypoint timeout after {max_t}s'
                     }
                 
                 # Check if waypoint reached
-                if distance <= self.waypoint_tolerance:
+                if reached:
                     # Waypoint reached - detailed completion logging
                     final_status = self._get_current_position_log()
                     completion_time = current_time - start_time
@@ -532,7 +779,7 @@ class WaypointMissionManager:
                     print(f"[WAYPOINT-{wp_num}] Final Altitude: {final_status['alt']:.1f}m")
                     print(f"[WAYPOINT-{wp_num}] Final Distance to Target: {distance:.1f}m")
                     print(f"[WAYPOINT-{wp_num}] Time Taken: {completion_time:.1f}s")
-                    print(f"[WAYPOINT-{wp_num}] Average Speed: {NavigationUtils.calculate_distance((start_pos['lat'], start_pos['lon']), current_pos) / completion_time:.1f}m/s")
+                    print(f"[WAYPOINT-{wp_num}] Average Speed: {distance_to(start_pos['lat'], start_pos['lon'], current_status['lat'], current_status['lon']) / completion_time:.1f}m/s")
                     print(f"[WAYPOINT-{wp_num}] Battery Used: {start_pos['battery'] - final_status['battery']:.1f}%")
                     
                     self.flight_logger.log_waypoint_reached(
@@ -540,7 +787,7 @@ class WaypointMissionManager:
                     )
                     
                     # Enhanced waypoint completion logging
-                    self.flight_logger.log_event('waypoint_completed_detailed', {
+                    self._log_event('waypoint_completed_detailed', {
                         'waypoint_number': wp_num,
                         'total_waypoints': total_wp,
                         'target_coordinates': waypoint,
@@ -551,20 +798,20 @@ class WaypointMissionManager:
                         'battery_used': start_pos['battery'] - final_status['battery']
                     })
                     
-                    if broadcast_func:
-                        await broadcast_func({
-                            'type': 'waypoint_reached',
-                            'waypoint_number': wp_num,
-                            'total_waypoints': total_wp,
-                            'coordinates': waypoint,
-                            'time_taken': completion_time,
-                            'final_status': final_status
-                        })
+                    self._broadcast({
+                        'type': 'waypoint_reached',
+                        'waypoint_number': wp_num,
+                        'total_waypoints': total_wp,
+                        'coordinates': waypoint,
+                        'time_taken': completion_time,
+                        'final_status': final_status
+                    })
                     
                     # Brief pause before next waypoint
-                    if wp_num < total_wp:
-                        print(f"[WAYPOINT-{wp_num}] Pausing 2 seconds before next waypoint...")
-                        await asyncio.sleep(2.0)
+                    pause = self._inter_waypoint_pause
+                    if pause > 0 and wp_num < total_wp:
+                        print(f"[WAYPOINT-{wp_num}] Pausing {pause}s before next waypoint...")
+                        await asyncio.sleep(pause)
                     
                     return {
                         'success': True,
@@ -574,31 +821,39 @@ class WaypointMissionManager:
                     }
                 
                 # Continuous safety monitoring during waypoint navigation
-                emergencies = self.safety_manager.check_emergency_conditions(vehicle)
+                now = time.monotonic()
+                if now - self._last_emerg_check >= _EMERGENCY_CHECK_INTERVAL_S:
+                    emergencies = check_emerg(vehicle)
+                    self._last_emerg_check = now
+                else:
+                    emergencies = ()
                 if emergencies:
-                    critical_emergencies = [e for e in emergencies if 'CRITICAL' in e]
-                    if critical_emergencies:
-                        # Critical emergency - immediate action
-                        await self.safety_manager.handle_emergency_landing(vehicle, critical_emergencies[0])
+                    critical = next((e for e in emergencies if 'CRITICAL' in e[0]), None)
+                    if critical is not None:
+                        critical = format_emergency(*critical)
+                        # Critical emergency - immediate action, shielded so a
+                        # cancelled mission task can't interrupt the landing
+                        await asyncio.shield(safety_manager.handle_emergency_landing(vehicle, critical))
                         return {
                             'success': False,
-                            'error': f'Critical emergency: {critical_emergencies[0]}',
+                            'error': f'Critical emergency: {critical}',
                             'emergency_action': 'EMERGENCY_LAND'
                         }
                 
-                # Brief pause before next check
-                await asyncio.sleep(0.5)
+                # Brief pause before next check, cut short by an abort
+                await self._wait_next_tick(0.5)
                 
         except Exception as e:
-            self.flight_logger.log_event('waypoint_error', {
+            msg = str(e)
+            self._log_event('waypoint_error', {
                 'waypoint_number': wp_num,
                 'coordinates': waypoint,
-                'error': str(e)
+                'error': msg
             })
             
             return {
                 'success': False,
-                'error': f'Waypoint execution error: {str(e)}'
+                'error': f'Waypoint execution error: {msg}'
             }
     
     async def _handle_waypoint_battery_emergency(self, battery_level: float, 
@@ -606,7 +861,7 @@ class WaypointMissionManager:
         """Handle battery emergency during waypoint mission."""
         vehicle = self.connection.vehicle
         
-        self.flight_logger.log_event('battery_emergency_waypoint', {
+        self._log_event('battery_emergency_waypoint', {
             'battery_level': battery_level,
             'mission_id': self.current_mission.mission_id if self.current_mission else 'unknown'
         })
@@ -616,9 +871,7 @@ class WaypointMissionManager:
             vehicle.mode = VehicleMode("LOITER")
             
             # Wait for mode change
-            timeout = time.time() + 5.0
-            while str(vehicle.mode) != "LOITER" and time.time() < timeout:
-                await asyncio.sleep(0.1)
+            await self.safety_manager.wait_for_mode(vehicle, "LOITER", timeout=5.0)
             
             # Align yaw to home position
             await self._align_yaw_to_home()
@@ -627,101 +880,104 @@ class WaypointMissionManager:
             return await self._prompt_battery_emergency_choice(battery_level, broadcast_func)
             
         except Exception as e:
-            self.flight_logger.log_event('battery_emergency_error', {
-                'error': str(e),
+            msg = str(e)
+            self._log_event('battery_emergency_error', {
+                'error': msg,
                 'battery_level': battery_level
             })
             
             # Default to RTL on error
-            await self.safety_manager.handle_emergency_rtl(vehicle, f"Battery emergency handling failed: {e}")
+            await asyncio.shield(self.safety_manager.handle_emergency_rtl(vehicle, f"Battery emergency handling failed: {msg}"))
             return "RTL"
     
+    def _snapshot_position(self) -> Tuple[Optional[float], Optional[float], Optional[float], Optional[float]]:
+        """Read current and home lat/lon together as (lat, lon, home_lat, home_lon)."""
+        vehicle = self.connection.vehicle
+        loc = vehicle.location.global_relative_frame
+        home = vehicle.home_location
+        if home:
+            return loc.lat, loc.lon, home.lat, home.lon
+        return loc.lat, loc.lon, None, None
+    
     async def _align_yaw_to_home(self):
         """Align drone yaw to face home position."""
-        vehicle = self.connection.vehicle
-        
         try:
-            current_pos = (vehicle.location.global_relative_frame.lat,
-                          vehicle.location.global_relative_frame.lon)
+            lat, lon, home_lat, home_lon = self._snapshot_position()
             
-            home_location = vehicle.home_location
-            if home_location:
-                home_pos = (home_location.lat, home_location.lon)
+            if home_lat is not None:
+                current_pos = (lat, lon)
+                home_pos = (home_lat, home_lon)
                 
                 # Calculate bearing to home
-                bearing = NavigationUtils.calculate_bearing(current_pos, home_pos)
+                if lat is None or lon is None or home_lon is None:
+                    bearing = None
+                else:
+                    bearing = wp_kernel.bearing_deg(float(lat), float(lon), float(home_lat), float(home_lon))
                 
                 if bearing is not None:
                     # Simple approach: Just log the bearing - RTL will handle orientation automatically
-                    print(f"[YAW] Calculated bearing to home: {bearing:.1f}°")
-                    
-                    self.flight_logger.log_event('yaw_calculated_to_home', {
+                    self._log_event('yaw_calculated_to_home', {
                         'bearing': bearing,
                         'current_position': current_pos,
                         'home_position': home_pos,
                         'note': 'RTL will auto-orient drone'
                     })
                 else:
-                    print("[YAW] Could not calculate bearing to home")
+                    self._log_event('yaw_bearing_unavailable', {
+                        'current_position': current_pos,
+                        'home_position': home_pos
+                    })
                     
         except Exception as e:
-            self.flight_logger.log_event('yaw_alignment_error', {'error': str(e)})
-            print(f"[YAW] Alignment calculation failed: {e}")
+            self._log_event('yaw_alignment_error', {'error': str(e)})
     
     async def _prompt_battery_emergency_choice(self, battery_level: float, 
                                              broadcast_func: Optional[Callable] = None) -> str:
         """Prompt user for emergency action choice."""
-        prompt_id = f"battery_emergency_{int(time.time())}"
+        vehicle = self.connection.vehicle
+        handlers = self._emergency_handlers
+        prompt_id = f"battery_emergency_{self._prompt_seq()}"
         
-        self.emergency_prompts[prompt_id] = {
+        entry = {
             'type': 'battery_emergency',
             'battery_level': battery_level,
             'timestamp': time.time(),
-            'response': None
+            'started': time.monotonic(),  # For response time; immune to wall-clock jumps
+            'response': None,
+            'event': asyncio.Event()  # Set by handle_emergency_response
         }
+        self._sweep_emergency_prompts()
+        self.emergency_prompts[prompt_id] = entry
         
-        if broadcast_func:
-            await broadcast_func({
-                'type': 'emergency_prompt',
-                'prompt_id': prompt_id,
-                'message': f'BATTERY EMERGENCY: {battery_level}% remaining. Choose action:',
-                'options': ['RTL', 'LAND'],
-                'timeout': WaypointConfig.EMERGENCY_RESPONSE_TIMEOUT
-            })
-        
-        # Wait for user response with timeout
-        timeout = time.time() + WaypointConfig.EMERGENCY_RESPONSE_TIMEOUT
-        
-        while time.time() < timeout:
-            if (prompt_id in self.emergency_prompts and 
-                self.emergency_prompts[prompt_id]['response']):
-                
-                choice = self.emergency_prompts[prompt_id]['response']
-                del self.emergency_prompts[prompt_id]
-                
-                # Execute chosen action
-                vehicle = self.connection.vehicle
-                if choice.upper() == 'RTL':
-                    await self.safety_manager.handle_emergency_rtl(vehicle, f"User choice: battery {battery_level}%")
-                elif choice.upper() == 'LAND':
-                    await self.safety_manager.handle_emergency_landing(vehicle, f"User choice: battery {battery_level}%")
-                
-                return choice.upper()
+        try:
+            if broadcast_func:
+                await broadcast_func({
+                    **_EMERGENCY_PROMPT_TEMPLATE,
+                    'prompt_id': prompt_id,
+                    'message': _EMERGENCY_MSG_FMT(battery_level)
+                })
             
-            await asyncio.sleep(0.1)
+            # Wait for user response with timeout
+            await asyncio.wait_for(entry['event'].wait(), timeout=WaypointConfig.EMERGENCY_RESPONSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self.emergency_prompts.pop(prompt_id, None)
         
-        # Timeout - default action
-        del self.emergency_prompts[prompt_id]
+        choice = entry['response']
+        if choice:
+            # Execute chosen action; anything unrecognised falls back to RTL
+            choice = choice.upper()
+            if choice not in handlers:
+                choice = 'RTL'
+            await asyncio.shield(handlers[choice](vehicle, f"User choice: battery {battery_level}%"))
+            return choice
         
-        vehicle = self.connection.vehicle
+        # Timeout - default action
         default_action = "RTL" if battery_level > WaypointConfig.EMERGENCY_BATTERY_LEVEL else "LAND"
+        await asyncio.shield(handlers[default_action](vehicle, f"Timeout: battery {battery_level}%"))
         
-        if default_action == "RTL":
-            await self.safety_manager.handle_emergency_rtl(vehicle, f"Timeout: battery {battery_level}%")
-        else:
-            await self.safety_manager.handle_emergency_landing(vehicle, f"Timeout: battery {battery_level}%")
-        
-        self.flight_logger.log_event('emergency_timeout_action', {
+        self._log_event('emergency_timeout_action', {
             'battery_level': battery_level,
             'action': default_action,
             'timeout': WaypointConfig.EMERGENCY_RESPONSE_TIMEOUT
@@ -729,15 +985,24 @@ class WaypointMissionManager:
         
         return default_action
     
+    def _sweep_emergency_prompts(self):
+        """Drop prompts older than twice the response timeout."""
+        cutoff = time.monotonic() - 2 * WaypointConfig.EMERGENCY_RESPONSE_TIMEOUT
+        for prompt_id in [pid for pid, p in self.emergency_prompts.items() if p['started'] < cutoff]:
+            del self.emergency_prompts[prompt_id]
+    
     def handle_emergency_response(self, prompt_id: str, choice: str) -> bool:
         """Handle user response to emergency prompt."""
-        if prompt_id in self.emergency_prompts:
-            self.emergency_prompts[prompt_id]['response'] = choice
+        entry = self.emergency_prompts.get(prompt_id)
+        if entry is not None:
+            entry['response'] = choice
+            if choice:
+                entry['event'].set()
             
-            self.flight_logger.log_event('emergency_response_received', {
+            self._log_event('emergency_response_received', {
                 'prompt_id': prompt_id,
                 'choice': choice,
-                'response_time': time.time() - self.emergency_prompts[prompt_id]['timestamp']
+                'response_time': time.monotonic() - entry['started']
             })
             
             return True
@@ -749,10 +1014,10 @@ class WaypointMissionManager:
         if not self.current_mission:
             return None
         
-        status = self.current_mission.to_dict()
+        status = dict(self.current_mission.to_dict())
         
         if self.mission_start_time:
-            status['runtime_seconds'] = (datetime.now() - self.mission_start_time).total_seconds()
+            status['runtime_seconds'] = time.monotonic() - self.mission_start_time
         
         return status
     
@@ -762,8 +1027,9 @@ class WaypointMissionManager:
             return False
         
         self.current_mission.status = "ABORTED"
+        self._abort_event.set()
         
-        self.flight_logger.log_event('mission_aborted', {
+        self._log_event('mission_aborted', {
             'mission_id': self.current_mission.mission_id,
             'reason': reason,
             'waypoints_completed': self.current_mission.current_waypoint_index
@@ -0,0 +1,109 @@
+"""
+Waypoint Navigation Kernels
+===========================
+
+Scalar numeric kernels evaluated on every waypoint monitor tick. They are
+compiled with Numba when it is installed and run as plain Python otherwise,
+so Numba stays an optional dependency.
+"""
+
+import math
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba is optional - kernels run as regular Python
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+EARTH_RADIUS_M = 6371000.0
+MAX_REALISTIC_DISTANCE = 20003931.0  # Half Earth's circumference
+INF = float('inf')
+
+
+# fastmath is deliberately not enabled: invalid coordinates are reported as
+# inf, and fastmath lets the compiler assume infinities never occur.
+@njit(cache=True)
+def haversine(lat1, lon1, lat2, lon2):
+    """Haversine distance in meters, inf for out-of-range coordinates."""
+    if not (-90.0 <= lat1 <= 90.0 and -90.0 <= lat2 <= 90.0 and
+            -180.0 <= lon1 <= 180.0 and -180.0 <= lon2 <= 180.0):
+        return INF
+    if lat1 == lat2 and lon1 == lon2:
+        return 0.0
+
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    delta_lat = math.radians(lat2 - lat1)
+    delta_lon = math.radians(lon2 - lon1)
+
+    a = (math.sin(delta_lat / 2) ** 2 +
+         math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2)
+    if a > 1.0:
+        a = 1.0
+
+    distance = EARTH_RADIUS_M * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    if distance < 0 or distance > MAX_REALISTIC_DISTANCE:
+        return INF
+    return distance
+
+
+@njit(cache=True)
+def bearing_deg(lat1, lon1, lat2, lon2):
+    """Initial bearing from point 1 to point 2 in degrees (0=North, 90=East)."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    delta_lon = math.radians(lon2 - lon1)
+
+    y = math.sin(delta_lon) * math.cos(phi2)
+    x = math.cos(phi1) * math.sin(phi2) - math.sin(phi1) * math.cos(phi2) * math.cos(delta_lon)
+    return (math.degrees(math.atan2(y, x)) + 360.0) % 360.0
+
+
+@njit(cache=True)
+def _check_wp(lat, lon, tlat, tlon, elapsed, tol, max_t):
+    d = haversine(lat, lon, tlat, tlon)
+    return d <= tol, elapsed > max_t, d
+
+
+@njit(cache=True)
+def progress_percent(distance, inv_initial_dist):
+    """Leg progress 0-100 given the distance left and 1/initial distance."""
+    if distance == INF:
+        return 0
+    pct_raw = (1.0 - distance * inv_initial_dist) * 100.0
+    return 0 if pct_raw < 0 else 100 if pct_raw > 100 else int(pct_raw)
+
+
+def check_waypoint(lat, lon, tlat, tlon, elapsed, tol, max_t):
+    """
+    Evaluate one monitor tick.
+
+    Returns:
+        (reached, timed_out, distance) - distance is inf when the current
+        position is missing or invalid
+    """
+    if lat is None or lon is None:
+        return False, elapsed > max_t, INF
+    return _check_wp(float(lat), float(lon), float(tlat), float(tlon),
+                     float(elapsed), float(tol), float(max_t))
+
+
+def warm_up() -> None:
+    """Trigger JIT compilation so the first mission tick doesn't pay for it."""
+    haversine(0.0, 0.0, 0.0, 0.0)
+    check_waypoint(0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 1.0)
+    progress_percent(0.0, 0.0)
+    bearing_deg(0.0, 0.0, 0.0, 0.0)
+
+
+# Compile once at import, before the event loop runs, so no constructor on the
+# loop stalls telemetry while the JIT works
+if NUMBA_AVAILABLE:
+    warm_up()
@@ -4,10 +4,19 @@ Flight Safety Manager
 Centralized safety validation with essential monitoring and logging.
 """
 
+import os
+import sys
 import time
+import queue
+import atexit
 import asyncio
+import bisect
 import logging
 import math
+import functools
+import threading
+import weakref
+from collections import deque, namedtuple
 from typing import Dict, Any, List, Tuple, Optional
 from datetime import datetime, timedelta
 from config.config import (
@@ -15,10 +24,250 @@ from config.config import (
     CommunicationSafetyConfig, SystemSafetyConfig, FlightLogger
 )
 from dronekit import VehicleMode
+from ..navigation.navigation_utils import NavigationUtils
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional - jump detection falls back to scalar Haversine
+    np = None
+
+POSITION_HISTORY_SIZE = 64  # Ring buffer of recent fixes used for jump detection
+CONNECTION_HISTORY_SIZE = 120  # Recent connection quality scores kept
+LOCATION_CACHE_TTL_S = 0.2  # Location frames are reused for this long within a failsafe cycle
+
+# GPS health states returned by FlightSafetyManager._gps_state
+GPS_OK = 'OK'
+GPS_DEGRADED = 'DEGRADED'
+GPS_FAILED = 'FAILED'
+
+# Display format for each emergency code's value (see format_emergency)
+_EMERGENCY_VALUE_FMT = {
+    'CRITICAL_BATTERY_LEVEL': '{}%',
+    'LOW_BATTERY_LEVEL': '{}%',
+    'CRITICAL_BATTERY_VOLTAGE': '{:.1f}V',
+    'GPS_FIX_LOST': '{}',
+    'GPS_SATELLITES_LOW': '{}',
+    'COMMUNICATION_LOST': '{:.1f}s',
+}
+
+
+def format_emergency(code: str, value: Any) -> str:
+    """Render a (code, value) emergency as text, e.g. 'CRITICAL_BATTERY_LEVEL_9%'."""
+    return f"{code}_{_EMERGENCY_VALUE_FMT.get(code, '{}').format(value)}"
+
+
+# Interned emergency mode names; dronekit's mode.name compares against these
+LAND_NAME = sys.intern("LAND")
+RTL_NAME = sys.intern("RTL")
+
+# Opt-in event loop stall reporting for development (DRONE_ASYNC_DEBUG=1)
+ASYNC_DEBUG = os.environ.get('DRONE_ASYNC_DEBUG') == '1'
+SLOW_CALLBACK_THRESHOLD_S = 0.05
+
+
+class _BufferedEventSink:
+    """Queues flight log events and writes them in batches from a background thread."""
+    
+    def __init__(self, flight_logger: FlightLogger, flush_interval: float = 0.1,
+                 max_batch: int = 256):
+        self._flight_logger = flight_logger
+        self._flush_interval = flush_interval
+        self._max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+    
+    def emit(self, event_type: str, data: Dict[str, Any]):
+        """Queue an event for the writer thread."""
+        self._queue.put_nowait((event_type, data))
+        if self._thread is None:
+            self._start()
+    
+    def flush(self):
+        """Block until every queued event has been written."""
+        if self._thread is not None:
+            self._queue.join()
+    
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='flight-safety-log', daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+    
+    def _run(self):
+        q = self._queue
+        while True:
+            batch = [q.get()]
+            while len(batch) < self._max_batch:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._flight_logger.log_events(batch)
+            except Exception as e:
+                print(f"[SAFETY] Log write error: {e}")
+            finally:
+                for _ in batch:
+                    q.task_done()
+            time.sleep(self._flush_interval)
+
+
+# Extra heartbeat age tolerated before vehicle-state validators fast-fail
+HEARTBEAT_GRACE_S = 2.0
+
+
+def _requires_fresh_heartbeat(method):
+    """
+    Fast-fail a (bool, issues) validator when the vehicle's heartbeat is stale.
+    
+    Readings from a dead link are stale, so the body is skipped and the
+    validation fails with a single 'stale telemetry' issue.
+    """
+    @functools.wraps(method)
+    def wrapper(self, vehicle, *args, **kwargs):
+        heartbeat = getattr(vehicle, "last_heartbeat", None)
+        if heartbeat is not None and heartbeat > self._max_hb_age + HEARTBEAT_GRACE_S:
+            return False, [f"Stale telemetry: last heartbeat {heartbeat:.1f}s ago"]
+        return method(self, vehicle, *args, **kwargs)
+    return wrapper
+
+
+@functools.lru_cache(maxsize=1024)
+def _home_distance(lat_q: float, lon_q: float, home_lat: float, home_lon: float) -> float:
+    """Distance to home from a position quantized to 5 decimal places (~1m)."""
+    return NavigationUtils.calculate_distance_scalar(lat_q, lon_q, home_lat, home_lon)
+
+
+class _BatterySnapshot:
+    """One read of a dronekit battery object, shared by the checks in a safety pass."""
+    
+    __slots__ = ('voltage', 'level', 'current', 'missing')
+    
+    def __init__(self, battery):
+        try:
+            self.voltage = getattr(battery, "voltage", None)
+            self.current = getattr(battery, "current", None)
+            self.level = getattr(battery, "level", None)
+        except Exception:
+            self.voltage = None
+            self.current = None
+            self.level = None
+        
+        # Consider None or zero as missing telemetry
+        self.missing = self._is_missing(self.voltage) and self._is_missing(self.level)
+    
+    @staticmethod
+    def _is_missing(value) -> bool:
+        return value is None or (isinstance(value, (int, float)) and float(value) <= 0.0)
+    
+    @staticmethod
+    def as_float(value) -> Optional[float]:
+        """value as a float, or None when absent or non-numeric."""
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except Exception:
+            return None
+
+
+class _VehicleSnapshot:
+    """One read of the vehicle attributes used by the anomaly and envelope checks; None when unavailable."""
+    
+    __slots__ = ('lat', 'lon', 'alt', 'voltage', 'airspeed', 'roll', 'pitch', 'mode_name', 'hb')
+    
+    def __init__(self, vehicle):
+        _g = getattr
+        frame = _g(_g(vehicle, 'location', None), 'global_frame', None)
+        attitude = _g(vehicle, 'attitude', None)
+        self.lat = _g(frame, 'lat', None)
+        self.lon = _g(frame, 'lon', None)
+        self.alt = _g(frame, 'alt', None)
+        self.voltage = _g(_g(vehicle, 'battery', None), 'voltage', None)
+        self.airspeed = _g(vehicle, 'airspeed', None)
+        self.roll = _g(attitude, 'roll', None)
+        self.pitch = _g(attitude, 'pitch', None)
+        self.mode_name = _g(_g(vehicle, 'mode', None), 'name', None)
+        self.hb = _g(vehicle, 'last_heartbeat', None)
+
+
+# Return-to-home model: 10 m/s cruise, 2% battery per minute, 10% reserve
+RTL_SPEED_MS = 10.0
+RTL_BATTERY_PCT_PER_MIN = 2.0
+RTL_BATTERY_MARGIN_PCT = 10.0
+RTL_DISTANCE_BIN_M = 10.0
+
+
+@functools.lru_cache(maxsize=256)
+def _rtl_feasibility(distance_bin: int, battery_bin: int) -> Tuple[bool, float]:
+    """(feasible, required battery %) for a distance bin (rounded up) and whole-percent battery (rounded down)."""
+    required = distance_bin * RTL_DISTANCE_BIN_M / RTL_SPEED_MS / 60.0 * RTL_BATTERY_PCT_PER_MIN
+    return battery_bin >= required + RTL_BATTERY_MARGIN_PCT, required
+
+
+_LocationFrames = namedtuple('_LocationFrames', 'global_frame relative_frame ts')
+
+
+class _LocationCache:
+    """Location frames shared by the failsafe handlers that run back to back in one cycle."""
+    
+    __slots__ = ('ttl', '_vehicle', '_frames')
+    
+    def __init__(self, ttl: float = LOCATION_CACHE_TTL_S):
+        self.ttl = ttl
+        self._vehicle = None
+        self._frames = None
+    
+    def get(self, vehicle) -> _LocationFrames:
+        now = time.monotonic()
+        frames = self._frames
+        if frames is not None and vehicle is self._vehicle and now - frames.ts <= self.ttl:
+            return frames
+        location = getattr(vehicle, 'location', None)
+        frames = _LocationFrames(getattr(location, 'global_frame', None),
+                                 getattr(location, 'global_relative_frame', None), now)
+        self._vehicle = vehicle
+        self._frames = frames
+        return frames
+    
+    def gps_alt(self, vehicle) -> float:
+        """GPS (global frame) altitude in meters, 0.0 when unavailable."""
+        try:
+            return float(self.get(vehicle).global_frame.alt or 0.0)
+        except (AttributeError, TypeError, ValueError):
+            return 0.0
+
 
 class FlightSafetyManager:
     """Centralized flight safety validation and monitoring."""
     
+    # Emergency modes are immutable - build them once
+    _MODE_LAND = VehicleMode(LAND_NAME)
+    _MODE_RTL = VehicleMode(RTL_NAME)
+    
+    # Battery level tiers: index = bisect_left(thresholds, level)
+    _BATT_LEVEL_THRESHOLDS = (20, 50)
+    _BATT_LEVEL_STATUS = ('CRITICAL', 'LOW', 'GOOD')
+    _BATT_EMERGENCY_THRESHOLDS = (10, 20)
+    _BATT_EMERGENCY_CODES = ('CRITICAL_BATTERY_LEVEL', 'LOW_BATTERY_LEVEL', None)
+    
+    # GPS failure / degradation limits (eph is HDOP x 100)
+    _GPS_FAIL_FIX = 2
+    _GPS_FAIL_SATS = 6
+    _GPS_MAX_EPH = 200
+    
+    # Emergency landing verdicts indexed by failed-check bits:
+    # 1 = too low, 2 = battery, 4 = GPS; the lowest set bit decides the reason
+    _LANDING_TOO_LOW = "Already too low for safe landing approach"
+    _LANDING_NO_BATTERY = "Insufficient battery for controlled landing"
+    _LANDING_NO_GPS = "Insufficient GPS for position hold during landing"
+    _LANDING_VERDICTS = (
+        None, _LANDING_TOO_LOW, _LANDING_NO_BATTERY, _LANDING_TOO_LOW,
+        _LANDING_NO_GPS, _LANDING_TOO_LOW, _LANDING_NO_BATTERY, _LANDING_TOO_LOW,
+    )
+    
     def __init__(self):
         # Setup logging
         logging.basicConfig(level=logging.INFO, 
@@ -28,6 +277,9 @@ class FlightSafetyManager:
         # Legacy logger for compatibility
         self.flight_logger = FlightLogger()
         
+        # Safety events are written off the validation path in batches
+        self._sink = _BufferedEventSink(self.flight_logger)
+        
         self.emergency_prompts = {}  # Track active emergency prompts
         
         # Safety state tracking
@@ -39,161 +291,220 @@ class FlightSafetyManager:
         self.weather_safe = True
         
         # Connection monitoring
-        self.connection_quality_history = []
+        self.connection_quality_history = deque(maxlen=CONNECTION_HISTORY_SIZE)
+        
+        # Recent position fixes (ring buffer) and how far jump detection has got
+        if np is not None:
+            self._pos_history = np.empty((POSITION_HISTORY_SIZE, 2), dtype=np.float64)
+        else:
+            self._pos_history = [(0.0, 0.0)] * POSITION_HISTORY_SIZE
+        self._pos_count = 0
+        self._pos_checked = 0
+        
+        # Previous altitude/voltage samples for anomaly deltas
+        self.last_altitude = None
+        self.last_voltage = None
+        
+        # Sensor failure handlers, bound once
+        self._failure_handlers = {
+            'compass': self._handle_compass_failure,
+            'accelerometer': self._handle_accelerometer_failure,
+            'barometer': self._handle_barometer_failure,
+            'gyroscope': self._handle_gyroscope_failure
+        }
+        
+        # Event loops already switched into stall-reporting mode
+        self._debugged_loops = weakref.WeakSet() if ASYNC_DEBUG else None
+        
+        # Location frames reused across the failure handlers of one cycle
+        self._loc_cache = _LocationCache()
+        
+        # Safety thresholds are static configuration - resolve them once
+        self._min_fix = GPSSafetyConfig.MIN_GPS_FIX
+        self._min_sats = GPSSafetyConfig.MIN_GPS_SATELLITES
+        self._min_batt_lvl = BatterySafetyConfig.MIN_BATTERY_LEVEL
+        self._max_hb_age = CommunicationSafetyConfig.MAX_HEARTBEAT_AGE
+        # (min, max) altitude indexed by is_takeoff; takeoff is more restrictive
+        self._alt_bounds = (
+            (FlightSafetyConfig.MIN_ALTITUDE, FlightSafetyConfig.MAX_ALTITUDE),
+            (max(FlightSafetyConfig.MIN_ALTITUDE, 2.0), min(FlightSafetyConfig.MAX_ALTITUDE, 30.0)),
+        )
+        self._max_horiz_dist = FlightSafetyConfig.MAX_HORIZONTAL_DISTANCE
+        self._max_flight_time = FlightSafetyConfig.MAX_FLIGHT_TIME
         
         self.logger.info("Enhanced Flight Safety Manager initialized")
+    
+    @staticmethod
+    def _now() -> Tuple[float, datetime]:
+        """Current (monotonic, wall clock) time."""
+        return time.monotonic(), datetime.now()
+    
+    def _check_blocking(self):
+        """With DRONE_ASYNC_DEBUG=1, make the running loop report steps that block it."""
+        if self._debugged_loops is None:
+            return
+        loop = asyncio.get_running_loop()
+        if loop in self._debugged_loops:
+            return
+        self._debugged_loops.add(loop)
+        # Debug mode logs any callback or task step slower than the threshold,
+        # with the creation traceback of the offending task
+        loop.slow_callback_duration = SLOW_CALLBACK_THRESHOLD_S
+        loop.set_debug(True)
+        self.logger.warning("Async debug: reporting event loop stalls over %.0fms",
+                            SLOW_CALLBACK_THRESHOLD_S * 1000)
+    
+    def flush_events(self):
+        """Write out any safety events still queued for the flight log."""
+        self._sink.flush()
         
     def validate_vehicle_ready(self, connection, require_armable: bool = True, 
                               emergency_override: bool = False) -> bool:
         # Validate if the vehicle is ready for flight
-        if not connection or not getattr(connection, "is_connected", False):
-            self.flight_logger.log_event('safety_check_failed', {'reason': 'not_connected'})
+        _g = getattr
+        if not connection or not _g(connection, "is_connected", False):
+            self._sink.emit('safety_check_failed', {'reason': 'not_connected'})
             return False
 
-        vehicle = getattr(connection, "vehicle", None)
+        vehicle = _g(connection, "vehicle", None)
         if not vehicle:
-            self.flight_logger.log_event('safety_check_failed', {'reason': 'no_vehicle'})
+            self._sink.emit('safety_check_failed', {'reason': 'no_vehicle'})
             return False
 
+        # Fetch everything the checks need in one sweep
+        last_heartbeat = _g(vehicle, "last_heartbeat", None)
+        gps = _g(vehicle, "gps_0", None)
+        battery = _g(vehicle, "battery", None)
+
         # Check heartbeat freshness
-        last_heartbeat = getattr(vehicle, "last_heartbeat", None)
         if (not emergency_override and last_heartbeat is not None and 
-            last_heartbeat > CommunicationSafetyConfig.MAX_HEARTBEAT_AGE):
-            self.flight_logger.log_event('safety_check_failed', {
+            last_heartbeat > self._max_hb_age):
+            self._sink.emit('safety_check_failed', {
                 'reason': 'stale_heartbeat',
                 'heartbeat_age': last_heartbeat
             })
             return False
 
         # Check armable status
-        if require_armable and not getattr(vehicle, "is_armable", False):
-            self.flight_logger.log_event('safety_check_failed', {'reason': 'not_armable'})
+        if require_armable and not _g(vehicle, "is_armable", False):
+            self._sink.emit('safety_check_failed', {'reason': 'not_armable'})
             return False
 
         # GPS validation
-        if not self._validate_gps_safety(vehicle, emergency_override):
+        if not self._validate_gps_safety(gps, emergency_override):
             return False
 
         # Battery validation  
-        if not self._validate_battery_safety(vehicle, emergency_override):
+        if not self._validate_battery_safety(battery, emergency_override):
             return False
 
-        self.flight_logger.log_event('safety_check_passed', {
+        self._sink.emit('safety_check_passed', {
             'require_armable': require_armable,
             'emergency_override': emergency_override
         })
         return True
     
-    def _validate_gps_safety(self, vehicle, emergency_override: bool = False) -> bool:
-        """Validate GPS safety requirements."""
-        gps = getattr(vehicle, "gps_0", None)
+    @staticmethod
+    def _read_gps(gps) -> Tuple[int, int, float]:
+        """(fix_type, satellites_visible, eph) from a gps_0 object in one pass; eph 999 when unknown."""
+        _g = getattr
+        eph = _g(gps, "eph", None)
+        return (_g(gps, "fix_type", 0) or 0,
+                _g(gps, "satellites_visible", 0) or 0,
+                999 if eph is None else eph)
+    
+    def _gps_state(self, reading: Optional[Tuple[int, int, float]]) -> str:
+        """Classify a GPS reading as GPS_OK, GPS_DEGRADED or GPS_FAILED."""
+        if reading is None:
+            return GPS_FAILED
+        fix, satellites, eph = reading
+        if fix < self._GPS_FAIL_FIX or satellites < self._GPS_FAIL_SATS:
+            return GPS_FAILED
+        if eph > self._GPS_MAX_EPH:
+            return GPS_DEGRADED
+        return GPS_OK
+    
+    def _validate_gps_safety(self, gps, emergency_override: bool = False) -> bool:
+        """Validate GPS safety requirements against the vehicle's gps_0 reading."""
+        min_fix = self._min_fix
+        min_sats = self._min_sats
         if not gps:
-            self.flight_logger.log_event('gps_check_failed', {'reason': 'no_gps_data'})
+            self._sink.emit('gps_check_failed', {'reason': 'no_gps_data'})
             return False
 
-        fix = getattr(gps, "fix_type", 0) or 0
-        satellites = getattr(gps, "satellites_visible", 0) or 0
+        fix, satellites, _ = self._read_gps(gps)
 
         # Check GPS fix quality
-        if fix < GPSSafetyConfig.MIN_GPS_FIX:
+        if fix < min_fix:
             if not emergency_override:
-                self.flight_logger.log_event('gps_check_failed', {
+                self._sink.emit('gps_check_failed', {
                     'reason': 'poor_fix',
                     'fix_type': fix,
-                    'required': GPSSafetyConfig.MIN_GPS_FIX
+                    'required': min_fix
                 })
                 return False
 
         # Check satellite count
-        if satellites < GPSSafetyConfig.MIN_GPS_SATELLITES:
+        if satellites < min_sats:
             if not emergency_override:
-                self.flight_logger.log_event('gps_check_failed', {
+                self._sink.emit('gps_check_failed', {
                     'reason': 'insufficient_satellites',
                     'satellites': satellites,
-                    'required': GPSSafetyConfig.MIN_GPS_SATELLITES
+                    'required': min_sats
                 })
                 return False
 
         return True
     
-    def _validate_battery_safety(self, vehicle, emergency_override: bool = False) -> bool:
-        """Validate battery safety requirements."""
-        battery = getattr(vehicle, "battery", None)
+    def _validate_battery_safety(self, battery, emergency_override: bool = False) -> bool:
+        """Validate battery safety requirements against the vehicle's battery reading."""
         # If battery object is missing or reports zero-values, treat as missing telemetry
         if not battery:
-            self.flight_logger.log_event('battery_check_failed', {'reason': 'no_battery_data'})
+            self._sink.emit('battery_check_failed', {'reason': 'no_battery_data'})
             return emergency_override
 
-        # Extract values safely
-        try:
-            voltage = getattr(battery, "voltage", None)
-            current = getattr(battery, "current", None)
-            level = getattr(battery, "level", None)
-        except Exception:
-            voltage = None
-            current = None
-            level = None
-
-        # Consider None or zero as missing telemetry
-        missing_voltage = (voltage is None) or (isinstance(voltage, (int, float)) and float(voltage) <= 0.0)
-        missing_level = (level is None) or (isinstance(level, (int, float)) and float(level) <= 0.0)
-
-        if missing_voltage and missing_level:
+        snap = _BatterySnapshot(battery)
+        if snap.missing:
             # No useful battery telemetry available
-            self.flight_logger.log_event('battery_check_failed', {
+            self._sink.emit('battery_check_failed', {
                 'reason': 'battery_telemetry_missing',
-                'voltage': voltage,
-                'level': level,
-                'current': current
+                'voltage': snap.voltage,
+                'level': snap.level,
+                'current': snap.current
             })
             return emergency_override
 
         # If level provided, check against threshold
-        if level is not None:
-            try:
-                lvl = float(level)
-            except Exception:
-                lvl = None
-            if lvl is not None and lvl < BatterySafetyConfig.MIN_BATTERY_LEVEL:
+        lvl = snap.as_float(snap.level)
+        if lvl is not None and lvl < self._min_batt_lvl:
+            if not emergency_override:
+                self._sink.emit('battery_check_failed', {
+                    'reason': 'low_battery_level',
+                    'level': lvl,
+                    'required': self._min_batt_lvl
+                })
+                return False
+
+        # If voltage provided, verify against minimum
+        volt = snap.as_float(snap.voltage)
+        if volt is not None:
+            min_voltage = BatterySafetyConfig.get_min_voltage_for_cell_count(volt)
+            if volt < min_voltage:
                 if not emergency_override:
-                    self.flight_logger.log_event('battery_check_failed', {
-                        'reason': 'low_battery_level',
-                        'level': lvl,
-                        'required': BatterySafetyConfig.MIN_BATTERY_LEVEL
+                    self._sink.emit('battery_check_failed', {
+                        'reason': 'low_battery_voltage',
+                        'voltage': volt,
+                        'min_required': min_voltage
                     })
                     return False
 
-        # If voltage provided, verify against minimum
-        if voltage is not None:
-            try:
-                volt = float(voltage)
-            except Exception:
-                volt = None
-            if volt is not None:
-                min_voltage = BatterySafetyConfig.get_min_voltage_for_cell_count(volt)
-                if volt < min_voltage:
-                    if not emergency_override:
-                        self.flight_logger.log_event('battery_check_failed', {
-                            'reason': 'low_battery_voltage',
-                            'voltage': volt,
-                            'min_required': min_voltage
-                        })
-                        return False
-
         return True
     
     def validate_altitude_safety(self, altitude: float, is_takeoff: bool = False) -> Tuple[bool, str]:
         """Validate altitude is within safe limits."""
         try:
             alt = float(altitude)
-            
-            if is_takeoff:
-                # More restrictive for takeoff
-                max_alt = min(FlightSafetyConfig.MAX_ALTITUDE, 30.0)
-                min_alt = max(FlightSafetyConfig.MIN_ALTITUDE, 2.0)   
-            else:
-                max_alt = FlightSafetyConfig.MAX_ALTITUDE
-                min_alt = FlightSafetyConfig.MIN_ALTITUDE
+            min_alt, max_alt = self._alt_bounds[bool(is_takeoff)]
             
             if min_alt <= alt <= max_alt:
                 return True, "Altitude within safe limits"
@@ -206,14 +517,12 @@ class FlightSafetyManager:
     def validate_distance_from_home(self, current_position: Tuple[float, float], 
                                    home_position: Tuple[float, float]) -> Tuple[bool, str]:
         """Validate drone is within safe distance from home."""
-        from ..navigation.navigation_utils import NavigationUtils
-        
         distance = NavigationUtils.calculate_distance(current_position, home_position)
         if distance == float('inf'):
             return False, "Cannot calculate distance from home"
         
-        if distance > FlightSafetyConfig.MAX_HORIZONTAL_DISTANCE:
-            return False, f"Distance from home {distance:.1f}m exceeds limit {FlightSafetyConfig.MAX_HORIZONTAL_DISTANCE}m"
+        if distance > self._max_horiz_dist:
+            return False, f"Distance from home {distance:.1f}m exceeds limit {self._max_horiz_dist}m"
         
         return True, f"Distance from home: {distance:.1f}m"
     
@@ -222,98 +531,126 @@ class FlightSafetyManager:
         if not flight_start_time:
             return True, "Flight time tracking not started"
         
-        flight_duration = (datetime.now() - flight_start_time).total_seconds()
+        flight_duration = (self._now()[1] - flight_start_time).total_seconds()
         
-        if flight_duration > FlightSafetyConfig.MAX_FLIGHT_TIME:
-            return False, f"Flight time {flight_duration:.0f}s exceeds limit {FlightSafetyConfig.MAX_FLIGHT_TIME}s"
+        if flight_duration > self._max_flight_time:
+            return False, f"Flight time {flight_duration:.0f}s exceeds limit {self._max_flight_time}s"
         
         return True, f"Flight time: {flight_duration:.0f}s"
     
-    def check_emergency_conditions(self, vehicle) -> List[str]:
-        """Check for emergency conditions that require immediate action."""
+    def check_emergency_conditions(self, vehicle, battery: Optional[_BatterySnapshot] = None,
+                                   gps: Optional[Tuple[int, int, float]] = None) -> List[Tuple[str, Any]]:
+        """Check for emergency conditions that require immediate action.
+        
+        battery, gps: readings already taken in this safety pass, if any.
+        
+        Returns:
+            (code, value) pairs, e.g. ('CRITICAL_BATTERY_LEVEL', 9); render
+            them with format_emergency
+        """
+        _g = getattr
         emergencies = []
         
         # Battery emergencies
-        battery = getattr(vehicle, "battery", None)
-        if battery:
-            level = getattr(battery, "level", 0) or 0
-            voltage = getattr(battery, "voltage", 0) or 0
+        if battery is None:
+            raw = _g(vehicle, "battery", None)
+            battery = _BatterySnapshot(raw) if raw else None
+        if battery is not None:
+            level = battery.level or 0
+            voltage = battery.voltage or 0
             
-            if level <= 10:  
-                emergencies.append(f"CRITICAL_BATTERY_LEVEL_{level}%")
-            elif level <= 20: 
-                emergencies.append(f"LOW_BATTERY_LEVEL_{level}%")
+            code = self._BATT_EMERGENCY_CODES[bisect.bisect_left(self._BATT_EMERGENCY_THRESHOLDS, level)]
+            if code:
+                emergencies.append((code, level))
             
             min_voltage = BatterySafetyConfig.get_min_voltage_for_cell_count(voltage)
             if voltage < min_voltage * 0.9:  # 90% of minimum voltage
-                emergencies.append(f"CRITICAL_BATTERY_VOLTAGE_{voltage:.1f}V")
+                emergencies.append(('CRITICAL_BATTERY_VOLTAGE', voltage))
         
         # GPS emergencies
-        gps = getattr(vehicle, "gps_0", None)
-        if gps:
-            fix = getattr(gps, "fix_type", 0) or 0
-            satellites = getattr(gps, "satellites_visible", 0) or 0
-            
-            if fix < 2:  # Lost GPS fix
-                emergencies.append(f"GPS_FIX_LOST_{fix}")
-            elif satellites < 6:  # Very low satellite count
-                emergencies.append(f"GPS_SATELLITES_LOW_{satellites}")
+        if gps is None:
+            raw = _g(vehicle, "gps_0", None)
+            gps = self._read_gps(raw) if raw else None
+        if gps is not None and self._gps_state(gps) is GPS_FAILED:
+            fix, satellites, _ = gps
+            if fix < self._GPS_FAIL_FIX:  # Lost GPS fix
+                emergencies.append(('GPS_FIX_LOST', fix))
+            else:  # Very low satellite count
+                emergencies.append(('GPS_SATELLITES_LOW', satellites))
         
         # Communication emergencies
-        last_heartbeat = getattr(vehicle, "last_heartbeat", None)
+        last_heartbeat = _g(vehicle, "last_heartbeat", None)
         if last_heartbeat and last_heartbeat > 10.0:  # 10 seconds without heartbeat
-            emergencies.append(f"COMMUNICATION_LOST_{last_heartbeat:.1f}s")
+            emergencies.append(('COMMUNICATION_LOST', last_heartbeat))
         
         return emergencies
     
-    async def handle_emergency_landing(self, vehicle, reason: str) -> bool:
-        """Execute emergency landing procedure."""
-        self.flight_logger.log_event('emergency_landing_initiated', {'reason': reason})
+    async def wait_for_mode(self, vehicle, mode_name: str, timeout: float = 10.0) -> bool:
+        """Wait until the vehicle reports mode_name via a mode listener. Returns False on timeout."""
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        
+        def _resolve():
+            if not fut.done():
+                fut.set_result(True)
+        
+        mode_name = sys.intern(mode_name)
+        
+        def on_mode(_vehicle, _name, mode):
+            # Invoked on dronekit's MAVLink thread; == short-circuits on identity
+            if getattr(mode, 'name', None) == mode_name:
+                loop.call_soon_threadsafe(_resolve)
         
         try:
-            # Switch to LAND mode
-            vehicle.mode = VehicleMode("LAND")
-            
-            # Wait for mode change
-            timeout = time.time() + 10.0
-            while str(vehicle.mode) != "LAND" and time.time() < timeout:
-                await asyncio.sleep(0.1)
-            
-            if str(vehicle.mode) == "LAND":
-                self.flight_logger.log_event('emergency_landing_success', {'mode': str(vehicle.mode)})
+            vehicle.add_attribute_listener('mode', on_mode)
+        except (AttributeError, TypeError):
+            # No listener support on this vehicle object - poll, yielding
+            # to the loop every turn until the deadline
+            deadline = loop.time() + timeout
+            while getattr(vehicle.mode, 'name', None) != mode_name:
+                if loop.time() >= deadline:
+                    return False
+                await asyncio.sleep(0)
+            return True
+        
+        try:
+            if getattr(vehicle.mode, 'name', None) == mode_name:
                 return True
-            else:
-                self.flight_logger.log_event('emergency_landing_failed', {'mode': str(vehicle.mode)})
-                return False
-                
-        except Exception as e:
-            self.flight_logger.log_event('emergency_landing_error', {'error': str(e)})
+            return await asyncio.wait_for(fut, timeout=timeout)
+        except asyncio.TimeoutError:
             return False
+        finally:
+            vehicle.remove_attribute_listener('mode', on_mode)
     
-    async def handle_emergency_rtl(self, vehicle, reason: str) -> bool:
-        """Execute return-to-launch procedure."""
-        self.flight_logger.log_event('emergency_rtl_initiated', {'reason': reason})
+    async def _switch_emergency_mode(self, vehicle, mode: VehicleMode, event_prefix: str, reason: str) -> bool:
+        """Command an emergency flight mode and wait for the vehicle to confirm it."""
+        self._check_blocking()
+        self._sink.emit(f'{event_prefix}_initiated', {'reason': reason})
         
+        target = mode.name
         try:
-            # Switch to RTL mode
-            vehicle.mode = VehicleMode("RTL")
-            
-            # Wait for mode change
-            timeout = time.time() + 10.0
-            while str(vehicle.mode) != "RTL" and time.time() < timeout:
-                await asyncio.sleep(0.1)
+            vehicle.mode = mode
             
-            if str(vehicle.mode) == "RTL":
-                self.flight_logger.log_event('emergency_rtl_success', {'mode': str(vehicle.mode)})
+            if await self.wait_for_mode(vehicle, target):
+                self._sink.emit(f'{event_prefix}_success', {'mode': target})
                 return True
             else:
-                self.flight_logger.log_event('emergency_rtl_failed', {'mode': str(vehicle.mode)})
+                self._sink.emit(f'{event_prefix}_failed', {'mode': getattr(vehicle.mode, 'name', None)})
                 return False
                 
         except Exception as e:
-            self.flight_logger.log_event('emergency_rtl_error', {'error': str(e)})
+            self._sink.emit(f'{event_prefix}_error', {'error': str(e)})
             return False
     
+    async def handle_emergency_landing(self, vehicle, reason: str) -> bool:
+        """Execute emergency landing procedure."""
+        return await self._switch_emergency_mode(vehicle, self._MODE_LAND, 'emergency_landing', reason)
+    
+    async def handle_emergency_rtl(self, vehicle, reason: str) -> bool:
+        """Execute return-to-launch procedure."""
+        return await self._switch_emergency_mode(vehicle, self._MODE_RTL, 'emergency_rtl', reason)
+    
+    @_requires_fresh_heartbeat
     def validate_takeoff_conditions(self, vehicle) -> Tuple[bool, List[str]]:
         """Comprehensive pre-takeoff safety validation."""
         issues = []
@@ -343,10 +680,46 @@ class FlightSafetyManager:
         
         return len(issues) == 0, issues
     
-    def generate_safety_report(self, vehicle) -> Dict[str, Any]:
+    async def generate_safety_report(self, vehicle) -> Dict[str, Any]:
         """Generate comprehensive safety status report."""
+        self._check_blocking()
+        # Probes that may block on dronekit run in worker threads
+        ready = asyncio.ensure_future(asyncio.to_thread(
+            self.validate_vehicle_ready, vehicle, require_armable=False, emergency_override=True))
+        report = self._build_safety_report(vehicle, self._now())
+        
+        if report['battery'].get('status') == 'UNKNOWN':
+            # Attempt to include parameter diagnostics if available
+            params = await self._read_parameters(vehicle, ('BATT_MONITOR', 'BATT_CAPACITY', 'BATT_ARM_VOLTAGE'))
+            if params:
+                report['battery']['params'] = params
+        
+        report['vehicle_ready'] = await ready
+        return report
+    
+    def generate_safety_report_sync(self, vehicle) -> Dict[str, Any]:
+        """Blocking generate_safety_report for callers without a running event loop."""
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self.generate_safety_report(vehicle))
+        finally:
+            loop.close()
+    
+    @staticmethod
+    async def _read_parameters(vehicle, names: Tuple[str, ...]) -> Dict[str, Any]:
+        """Read vehicle parameters concurrently; unreadable ones come back as None."""
+        parameters = getattr(vehicle, 'parameters', None)
+        if parameters is None:
+            return {}
+        
+        values = await asyncio.gather(*[asyncio.to_thread(parameters.get, name, None) for name in names],
+                                      return_exceptions=True)
+        return {name: (None if isinstance(value, Exception) else value)
+                for name, value in zip(names, values)}
+    
+    def _build_safety_report(self, vehicle, now: Tuple[float, datetime]) -> Dict[str, Any]:
         report = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now[1].isoformat(),
             'vehicle_ready': False,
             'battery': {},
             'gps': {},
@@ -355,35 +728,20 @@ class FlightSafetyManager:
             'recommendations': []
         }
         
-        # Vehicle readiness
-        report['vehicle_ready'] = self.validate_vehicle_ready(vehicle, require_armable=False, 
-                                                             emergency_override=True)
-        
         # Battery status
         battery = getattr(vehicle, "battery", None)
-        if battery:
-            # Include raw battery object for diagnostics
-            try:
-                level = getattr(battery, "level", None)
-                voltage = getattr(battery, "voltage", None)
-                current = getattr(battery, "current", None)
-            except Exception:
-                level = None
-                voltage = None
-                current = None
+        snap = _BatterySnapshot(battery) if battery else None
+        if snap is not None:
+            level = snap.level
+            voltage = snap.voltage
+            current = snap.current
 
             # Determine status more permissively when telemetry is missing
-            if (level is None or (isinstance(level, (int, float)) and float(level) <= 0)) and \
-               (voltage is None or (isinstance(voltage, (int, float)) and float(voltage) <= 0)):
+            if snap.missing:
                 status = 'UNKNOWN'
             else:
                 level_val = (int(level) if level is not None else 0)
-                if level_val > 50:
-                    status = 'GOOD'
-                elif level_val > 20:
-                    status = 'LOW'
-                else:
-                    status = 'CRITICAL'
+                status = self._BATT_LEVEL_STATUS[bisect.bisect_left(self._BATT_LEVEL_THRESHOLDS, level_val)]
 
             report['battery'] = {
                 'level_percent': level,
@@ -400,26 +758,12 @@ class FlightSafetyManager:
                 report['recommendations'].append(
                     'Battery telemetry missing (voltage/level=0 or null). Check power module, telemetry wiring, and FC parameter BATT_MONITOR/BATT_CAPACITY.'
                 )
-                # Attempt to include parameter diagnostics if available
-                try:
-                    params = {}
-                    if hasattr(vehicle, 'parameters'):
-                        for p in ('BATT_MONITOR', 'BATT_CAPACITY', 'BATT_ARM_VOLTAGE'):
-                            try:
-                                val = vehicle.parameters.get(p, None)
-                                params[p] = val
-                            except Exception:
-                                params[p] = None
-                    if params:
-                        report['battery']['params'] = params
-                except Exception:
-                    pass
         
         # GPS status
         gps = getattr(vehicle, "gps_0", None)
-        if gps:
-            fix = getattr(gps, "fix_type", 0) or 0
-            satellites = getattr(gps, "satellites_visible", 0) or 0
+        gps_reading = self._read_gps(gps) if gps else None
+        if gps_reading is not None:
+            fix, satellites, _ = gps_reading
             report['gps'] = {
                 'fix_type': fix,
                 'satellites': satellites,
@@ -434,7 +778,8 @@ class FlightSafetyManager:
         }
         
         # Emergency conditions
-        report['emergencies'] = self.check_emergency_conditions(vehicle)
+        report['emergencies'] = [format_emergency(code, value) for code, value in
+                                 self.check_emergency_conditions(vehicle, battery=snap, gps=gps_reading)]
         
         # Generate recommendations
         if report['battery'].get('level_percent', 0) < 30:
@@ -457,10 +802,12 @@ class FlightSafetyManager:
         anomalies = []
         
         try:
+            snap = _VehicleSnapshot(vehicle)
+            
             # Check for rapid altitude changes
-            if hasattr(vehicle, 'location') and vehicle.location.global_frame:
-                current_alt = vehicle.location.global_frame.alt
-                if hasattr(self, 'last_altitude') and self.last_altitude:
+            current_alt = snap.alt
+            if current_alt is not None:
+                if self.last_altitude:
                     alt_change = abs(current_alt - self.last_altitude)
                     if alt_change > 10:  # >10m sudden change
                         anomalies.append({
@@ -468,29 +815,26 @@ class FlightSafetyManager:
                             'change': alt_change,
                             'severity': 'critical'
                         })
-                        self.logger.error(f"Rapid altitude change detected: {alt_change}m")
+                        self.logger.error("Rapid altitude change detected: %sm", alt_change)
                 
                 self.last_altitude = current_alt
             
             # Check for GPS jumps
-            if hasattr(vehicle, 'location') and vehicle.location.global_frame:
-                current_pos = (vehicle.location.global_frame.lat, vehicle.location.global_frame.lon)
-                if hasattr(self, 'last_position') and self.last_position:
-                    distance = self._calculate_distance(self.last_position, current_pos)
-                    if distance > 100:  # >100m sudden jump
-                        anomalies.append({
-                            'type': 'position_jump',
-                            'distance': distance,
-                            'severity': 'critical'
-                        })
-                        self.logger.error(f"GPS position jump detected: {distance}m")
-                
-                self.last_position = current_pos
+            if snap.lat is not None:
+                self.record_position(snap.lat, snap.lon)
+                distance = self._max_position_jump()
+                if distance > 100:  # >100m sudden jump
+                    anomalies.append({
+                        'type': 'position_jump',
+                        'distance': distance,
+                        'severity': 'critical'
+                    })
+                    self.logger.error("GPS position jump detected: %sm", distance)
             
             # Check for voltage drops
-            if hasattr(vehicle, 'battery'):
-                voltage = getattr(vehicle.battery, 'voltage', None)
-                if voltage and hasattr(self, 'last_voltage') and self.last_voltage:
+            voltage = snap.voltage
+            if voltage:
+                if self.last_voltage:
                     voltage_drop = self.last_voltage - voltage
                     if voltage_drop > 2.0:  # >2V sudden drop
                         anomalies.append({
@@ -498,16 +842,55 @@ class FlightSafetyManager:
                             'drop': voltage_drop,
                             'severity': 'critical'
                         })
-                        self.logger.critical(f"Critical voltage drop: {voltage_drop}V")
+                        self.logger.critical("Critical voltage drop: %sV", voltage_drop)
                 
-                if voltage:
-                    self.last_voltage = voltage
+                self.last_voltage = voltage
         
         except Exception as e:
-            self.logger.error(f"Anomaly detection error: {e}")
+            self.logger.error("Anomaly detection error: %s", e)
         
         return anomalies
     
+    def record_position(self, lat: Optional[float], lon: Optional[float]) -> None:
+        """Append a position fix to the jump-detection ring buffer."""
+        if lat is None or lon is None:
+            return
+        self._pos_history[self._pos_count % POSITION_HISTORY_SIZE] = (lat, lon)
+        self._pos_count += 1
+    
+    def _max_position_jump(self) -> float:
+        """Largest step between consecutive fixes recorded since the last check."""
+        count = self._pos_count
+        start = max(self._pos_checked, count - POSITION_HISTORY_SIZE + 1, 1)
+        self._pos_checked = count
+        if start >= count:
+            return 0.0
+        
+        hist = self._pos_history
+        if np is not None:
+            idx = np.arange(start, count) % POSITION_HISTORY_SIZE
+            prev = (idx - 1) % POSITION_HISTORY_SIZE
+            steps = self._haversine_batch(hist[prev, 0], hist[prev, 1],
+                                          hist[idx, 0], hist[idx, 1])
+            return float(steps.max())
+        
+        return max(self._calculate_distance(hist[(i - 1) % POSITION_HISTORY_SIZE],
+                                            hist[i % POSITION_HISTORY_SIZE])
+                   for i in range(start, count))
+    
+    @staticmethod
+    def _haversine_batch(lat1, lon1, lat2, lon2):
+        """Vectorized Haversine distance in meters over NumPy arrays."""
+        lat1_rad = np.radians(lat1)
+        lat2_rad = np.radians(lat2)
+        half_dlat = np.radians(lat2 - lat1) * 0.5
+        half_dlon = np.radians(lon2 - lon1) * 0.5
+        
+        a = (np.sin(half_dlat) ** 2 +
+             np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(half_dlon) ** 2)
+        a = np.clip(a, 0.0, 1.0)
+        return 6371000 * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    
     def _calculate_distance(self, pos1: Tuple[float, float], pos2: Tuple[float, float]) -> float:
         """Calculate distance between two GPS coordinates using Haversine formula."""
         try:
@@ -542,14 +925,16 @@ class FlightSafetyManager:
         if heartbeat:
             if heartbeat > 5.0:
                 quality_score = 0.1  # Very poor
-                self.logger.warning(f"Poor connection: {heartbeat}s heartbeat")
+                self.logger.warning("Poor connection: %ss heartbeat", heartbeat)
             elif heartbeat > 3.0:
                 quality_score = 0.5  # Poor
             elif heartbeat > 1.0:
                 quality_score = 0.8  # Fair
         
+        self.connection_quality_history.append(quality_score)
         return quality_score
     
+    @_requires_fresh_heartbeat
     def validate_environmental_conditions(self, vehicle) -> Tuple[bool, List[str]]:
         """Validate environmental flight conditions."""
         issues = []
@@ -559,29 +944,30 @@ class FlightSafetyManager:
             wind_speed = getattr(vehicle, 'wind_speed', None)
             if wind_speed and wind_speed > self.wind_speed_limit:
                 issues.append(f"Wind speed too high: {wind_speed:.1f} m/s (limit: {self.wind_speed_limit} m/s)")
-                self.logger.warning(f"High wind speed detected: {wind_speed:.1f} m/s")
+                self.logger.warning("High wind speed detected: %.1f m/s", wind_speed)
             
             # Check temperature extremes (if available)
             temperature = getattr(vehicle, 'temperature', None)
             if temperature:
                 if temperature < -20 or temperature > 60:  # Celsius
                     issues.append(f"Temperature extreme: {temperature}°C")
-                    self.logger.warning(f"Extreme temperature: {temperature}°C")
+                    self.logger.warning("Extreme temperature: %s°C", temperature)
             
             # Check pressure altitude consistency
             pressure_alt = getattr(vehicle, 'pressure_alt', None)
-            gps_alt = getattr(vehicle.location.global_frame, 'alt', None) if hasattr(vehicle, 'location') else None
+            gps_alt = _VehicleSnapshot(vehicle).alt
             
             if pressure_alt and gps_alt and abs(pressure_alt - gps_alt) > 50:
                 issues.append(f"Altitude mismatch: Pressure={pressure_alt}m, GPS={gps_alt}m")
-                self.logger.warning(f"Altitude sensor mismatch detected")
+                self.logger.warning("Altitude sensor mismatch detected")
             
         except Exception as e:
-            self.logger.error(f"Environmental validation error: {e}")
+            self.logger.error("Environmental validation error: %s", e)
             issues.append("Environmental sensor error")
         
         return len(issues) == 0, issues
     
+    @_requires_fresh_heartbeat
     def validate_flight_envelope(self, vehicle, target_altitude: float = None, 
                                target_speed: float = None) -> Tuple[bool, List[str]]:
         """Validate flight is within safe envelope parameters."""
@@ -601,24 +987,23 @@ class FlightSafetyManager:
                 if target_speed > max_speed:
                     issues.append(f"Target speed too high: {target_speed:.1f}m/s (max: {max_speed}m/s)")
             
+            snap = _VehicleSnapshot(vehicle)
+            
             # Check current flight parameters
-            if hasattr(vehicle, 'airspeed') and vehicle.airspeed:
-                if vehicle.airspeed > 25.0:  # 25 m/s = ~90 km/h
-                    issues.append(f"Current airspeed excessive: {vehicle.airspeed:.1f}m/s")
+            if snap.airspeed:
+                if snap.airspeed > 25.0:  # 25 m/s = ~90 km/h
+                    issues.append(f"Current airspeed excessive: {snap.airspeed:.1f}m/s")
             
             # Check attitude limits
-            if hasattr(vehicle, 'attitude'):
-                attitude = vehicle.attitude
-                max_roll = 45.0  # degrees
-                max_pitch = 45.0  # degrees
-                
-                if abs(attitude.roll) > max_roll:
-                    issues.append(f"Roll angle excessive: {attitude.roll:.1f}° (limit: ±{max_roll}°)")
-                if abs(attitude.pitch) > max_pitch:
-                    issues.append(f"Pitch angle excessive: {attitude.pitch:.1f}° (limit: ±{max_pitch}°)")
+            max_roll = 45.0  # degrees
+            max_pitch = 45.0  # degrees
+            if snap.roll is not None and abs(snap.roll) > max_roll:
+                issues.append(f"Roll angle excessive: {snap.roll:.1f}° (limit: ±{max_roll}°)")
+            if snap.pitch is not None and abs(snap.pitch) > max_pitch:
+                issues.append(f"Pitch angle excessive: {snap.pitch:.1f}° (limit: ±{max_pitch}°)")
         
         except Exception as e:
-            self.logger.error(f"Flight envelope validation error: {e}")
+            self.logger.error("Flight envelope validation error: %s", e)
             issues.append("Flight envelope check error")
         
         return len(issues) == 0, issues
@@ -629,17 +1014,17 @@ class FlightSafetyManager:
             gps = getattr(vehicle, 'gps_0', None)
             if not gps:
                 self.logger.critical("Complete GPS failure detected")
-                self.drone_logger.log_emergency("GPS_FAILURE", {"type": "complete_loss"})
+                self.flight_logger.log_emergency("GPS_FAILURE", {"type": "complete_loss"})
                 return {"action": "emergency_land", "reason": "GPS complete failure"}
             
-            satellites = getattr(gps, 'satellites_visible', 0)
-            eph = getattr(gps, 'eph', 999)
-            fix_type = getattr(gps, 'fix_type', 0)
+            reading = self._read_gps(gps)
+            fix_type, satellites, eph = reading
+            state = self._gps_state(reading)
             
             # Critical GPS degradation
-            if fix_type < 2 or satellites < 6:
-                self.logger.critical(f"Critical GPS degradation: fix_type={fix_type}, satellites={satellites}")
-                self.drone_logger.log_emergency("GPS_DEGRADATION", {
+            if state is GPS_FAILED:
+                self.logger.critical("Critical GPS degradation: fix_type=%s, satellites=%s", fix_type, satellites)
+                self.flight_logger.log_emergency("GPS_DEGRADATION", {
                     "fix_type": fix_type,
                     "satellites": satellites,
                     "hdop": eph
@@ -647,41 +1032,35 @@ class FlightSafetyManager:
                 return {"action": "immediate_rtl", "reason": "GPS critical degradation"}
             
             # Moderate GPS issues
-            if satellites < 6 or eph > 200:
-                self.logger.warning(f"GPS degradation: satellites={satellites}, HDOP={eph}")
+            if state is GPS_DEGRADED:
+                self.logger.warning("GPS degradation: satellites=%s, HDOP=%s", satellites, eph)
                 return {"action": "reduce_speed", "reason": "GPS degraded accuracy"}
             
             return {"action": "continue", "reason": "GPS acceptable"}
             
         except Exception as e:
-            self.logger.error(f"GPS degradation handler error: {e}")
+            self.logger.error("GPS degradation handler error: %s", e)
             return {"action": "emergency_land", "reason": "GPS handler failure"}
     
     def handle_sensor_failure(self, vehicle, sensor_type: str) -> Dict[str, Any]:
         """Handle specific sensor failure scenarios."""
         try:
-            self.logger.critical(f"Sensor failure detected: {sensor_type}")
-            
-            failure_handlers = {
-                'compass': self._handle_compass_failure,
-                'accelerometer': self._handle_accelerometer_failure,
-                'barometer': self._handle_barometer_failure,
-                'gyroscope': self._handle_gyroscope_failure
-            }
+            self.logger.critical("Sensor failure detected: %s", sensor_type)
             
-            if sensor_type in failure_handlers:
-                return failure_handlers[sensor_type](vehicle)
+            handler = self._failure_handlers.get(sensor_type)
+            if handler is not None:
+                return handler(vehicle)
             else:
-                self.logger.error(f"Unknown sensor type: {sensor_type}")
+                self.logger.error("Unknown sensor type: %s", sensor_type)
                 return {"action": "emergency_land", "reason": f"Unknown sensor failure: {sensor_type}"}
         
         except Exception as e:
-            self.logger.error(f"Sensor failure handler error: {e}")
+            self.logger.error("Sensor failure handler error: %s", e)
             return {"action": "emergency_land", "reason": "Sensor failure handler error"}
     
     def _handle_compass_failure(self, vehicle) -> Dict[str, Any]:
         """Handle compass/magnetometer failure."""
-        self.drone_logger.log_emergency("COMPASS_FAILURE", {"timestamp": datetime.now().isoformat()})
+        self.flight_logger.log_emergency("COMPASS_FAILURE", {"timestamp": self._now()[1].isoformat()})
         
         # Check if we have GPS heading as backup
         gps = getattr(vehicle, 'gps_0', None)
@@ -694,15 +1073,15 @@ class FlightSafetyManager:
     
     def _handle_accelerometer_failure(self, vehicle) -> Dict[str, Any]:
         """Handle accelerometer failure."""
-        self.drone_logger.log_emergency("ACCELEROMETER_FAILURE", {"timestamp": datetime.now().isoformat()})
+        self.flight_logger.log_emergency("ACCELEROMETER_FAILURE", {"timestamp": self._now()[1].isoformat()})
         return {"action": "gentle_rtl", "reason": "Accelerometer failure - reduced maneuvering"}
     
     def _handle_barometer_failure(self, vehicle) -> Dict[str, Any]:
         """Handle barometer failure."""
-        self.drone_logger.log_emergency("BAROMETER_FAILURE", {"timestamp": datetime.now().isoformat()})
+        self.flight_logger.log_emergency("BAROMETER_FAILURE", {"timestamp": self._now()[1].isoformat()})
         
         # Check if GPS altitude is available
-        gps_alt = getattr(vehicle.location.global_frame, 'alt', None) if hasattr(vehicle, 'location') else None
+        gps_alt = self._loc_cache.gps_alt(vehicle)
         if gps_alt:
             self.logger.warning("Barometer failed - using GPS altitude")
             return {"action": "gps_altitude_mode", "reason": "Barometer failure - GPS altitude backup"}
@@ -711,29 +1090,23 @@ class FlightSafetyManager:
     
     def _handle_gyroscope_failure(self, vehicle) -> Dict[str, Any]:
         """Handle gyroscope failure."""
-        self.drone_logger.log_emergency("GYROSCOPE_FAILURE", {"timestamp": datetime.now().isoformat()})
+        self.flight_logger.log_emergency("GYROSCOPE_FAILURE", {"timestamp": self._now()[1].isoformat()})
         return {"action": "emergency_land", "reason": "Gyroscope failure - critical for stability"}
     
     def assess_emergency_landing_feasibility(self, vehicle, target_location=None) -> Dict[str, Any]:
         """Assess if emergency landing is feasible at current or target location."""
         try:
-            current_alt = getattr(vehicle.location.global_frame, 'alt', 0) if hasattr(vehicle, 'location') else 0
-            
-            # Check altitude for safe landing
-            if current_alt < 5:
-                return {"feasible": False, "reason": "Already too low for safe landing approach"}
-            
-            # Check battery for landing procedure
+            current_alt = self._loc_cache.gps_alt(vehicle)
             battery = getattr(vehicle, 'battery', None)
-            battery_level = getattr(battery, 'level', 0) if battery else 0
-            
-            if battery_level < 5:
-                return {"feasible": False, "reason": "Insufficient battery for controlled landing"}
-            
-            # Check GPS for position reference
+            battery_level = (getattr(battery, 'level', 0) or 0) if battery else 0
             gps = getattr(vehicle, 'gps_0', None)
-            if gps and getattr(gps, 'fix_type', 0) < 2:
-                return {"feasible": False, "reason": "Insufficient GPS for position hold during landing"}
+            gps_fix = (getattr(gps, 'fix_type', 0) or 0) if gps else 0
+            
+            # Altitude for a safe approach, battery for the landing procedure,
+            # GPS (when present) for position hold - evaluated together
+            failed = (current_alt < 5) | ((battery_level < 5) << 1) | ((bool(gps) and gps_fix < 2) << 2)
+            if failed:
+                return {"feasible": False, "reason": self._LANDING_VERDICTS[failed]}
             
             # Estimate landing time requirement
             descent_rate = 2.0  # m/s safe descent rate
@@ -744,11 +1117,11 @@ class FlightSafetyManager:
                 "estimated_time": landing_time,
                 "altitude": current_alt,
                 "battery_level": battery_level,
-                "gps_fix": getattr(gps, 'fix_type', 0) if gps else 0
+                "gps_fix": gps_fix
             }
             
         except Exception as e:
-            self.logger.error(f"Landing feasibility assessment error: {e}")
+            self.logger.error("Landing feasibility assessment error: %s", e)
             return {"feasible": False, "reason": f"Assessment error: {e}"}
     
     def calculate_emergency_return_feasibility(self, vehicle, home_location) -> Dict[str, Any]:
@@ -758,30 +1131,35 @@ class FlightSafetyManager:
                 return {"feasible": False, "reason": "No home location set"}
             
             # Get current position
-            current_location = getattr(vehicle.location, 'global_frame', None) if hasattr(vehicle, 'location') else None
-            if not current_location:
+            current_location = self._loc_cache.get(vehicle).global_frame
+            if not current_location or current_location.lat is None or current_location.lon is None:
                 return {"feasible": False, "reason": "No current position available"}
             
-            # Calculate distance to home
-            from ..navigation.navigation_utils import NavigationUtils
-            nav_utils = NavigationUtils()
-            
-            distance = nav_utils.calculate_distance(
-                (current_location.lat, current_location.lon),
-                (home_location.lat, home_location.lon)
+            # Calculate distance to home; repeated checks from (nearly) the
+            # same spot hit the cache. Home is part of the key, so moving it
+            # never returns a stale distance.
+            distance = _home_distance(
+                round(current_location.lat, 5), round(current_location.lon, 5),
+                home_location.lat, home_location.lon
             )
             
             # Estimate flight time (assuming 10 m/s average speed)
-            flight_time = distance / 10.0  # seconds
+            flight_time = distance / RTL_SPEED_MS  # seconds
             
             # Check battery capacity
             battery = getattr(vehicle, 'battery', None)
             battery_level = getattr(battery, 'level', 0) if battery else 0
             
-            # Conservative estimate: need 2% battery per minute of flight
-            required_battery = (flight_time / 60.0) * 2.0
+            if distance == math.inf:
+                return {"feasible": False, "reason": "Invalid position for distance to home",
+                        "distance": distance, "flight_time": flight_time}
+            
+            # Binning errs on the safe side: distance rounds up, battery down
+            feasible, required_battery = _rtl_feasibility(
+                math.ceil(distance / RTL_DISTANCE_BIN_M), int(battery_level)
+            )
             
-            if battery_level < required_battery + 10:  # 10% safety margin
+            if not feasible:
                 return {
                     "feasible": False,
                     "reason": f"Insufficient battery: need {required_battery:.1f}%, have {battery_level}%",
@@ -798,5 +1176,5 @@ class FlightSafetyManager:
             }
             
         except Exception as e:
-            self.logger.error(f"RTL feasibility calculation error: {e}")
+            self.logger.error("RTL feasibility calculation error: %s", e)
             return {"feasible": False, "reason": f"Calculation error: {e}"}
\ No newline at end of file
@@ -10,96 +10,103 @@ import json
 import sys
 import time
 
+async def _dispatch_responses(websocket, pending):
+    """Route replies to their waiting request by "id"; other frames (telemetry) are ignored"""
+    try:
+        async for message in websocket:
+            try:
+                result = json.loads(message)
+            except json.JSONDecodeError:
+                continue
+            future = pending.pop(result.get("id"), None) if isinstance(result, dict) else None
+            if future is not None and not future.done():
+                future.set_result(result)
+    except websockets.exceptions.ConnectionClosed as e:
+        error = e
+    else:
+        error = ConnectionError("WebSocket closed before all responses arrived")
+    for future in pending.values():
+        if not future.done():
+            future.set_exception(error)
+
+
+async def round_trip(websocket, pending, command):
+    """Send a command and wait for the response carrying the same id"""
+    future = asyncio.get_running_loop().create_future()
+    pending[command["id"]] = future
+    await websocket.send(json.dumps(command))
+    return await future
+
+
 async def test_waypoint_commands():
     """Test waypoint command execution"""
     uri = "ws://localhost:8765"
     
+    test_waypoints = [
+        {"latitude": 28.5245, "longitude": 77.5770, "altitude": 20, "order": 0},
+        {"latitude": 28.5255, "longitude": 77.5780, "altitude": 20, "order": 1},
+        {"latitude": 28.5265, "longitude": 77.5790, "altitude": 20, "order": 2}
+    ]
+    
+    tests = [
+        ("Test 1: Validate waypoints", "Validate waypoints result", {
+            "type": "validate_waypoints",
+            "payload": {"waypoints": test_waypoints},
+            "id": "test_validate_1"
+        }),
+        ("Test 2: Calculate mission statistics", "Mission stats result", {
+            "type": "calculate_mission_stats", 
+            "payload": {"waypoints": test_waypoints},
+            "id": "test_stats_1"
+        }),
+        ("Test 3: Generate grid mission", "Grid mission result", {
+            "type": "generate_grid_mission",
+            "payload": {
+                "start_lat": 28.5245,
+                "start_lon": 77.5770,
+                "grid_size": 3,
+                "spacing": 50.0,
+                "altitude": 25.0
+            },
+            "id": "test_grid_1"
+        }),
+        ("Test 4: Generate circular mission", "Circular mission result", {
+            "type": "generate_circular_mission",
+            "payload": {
+                "center_lat": 28.5245,
+                "center_lon": 77.5770,
+                "radius_meters": 100.0,
+                "num_points": 6,
+                "altitude": 30.0
+            },
+            "id": "test_circular_1"
+        }),
+        # Mission status (without drone connection)
+        ("Test 5: Check mission status", "Mission status result", {
+            "type": "waypoint_mission_status",
+            "id": "test_status_1"
+        }),
+    ]
+    
     try:
         # Connect to Python WebSocket server
         async with websockets.connect(uri) as websocket:
             print("✅ Connected to Python WebSocket server")
             
-            # Test 1: Validate waypoints
-            print("\n🧪 Test 1: Validate waypoints")
-            test_waypoints = [
-                {"latitude": 28.5245, "longitude": 77.5770, "altitude": 20, "order": 0},
-                {"latitude": 28.5255, "longitude": 77.5780, "altitude": 20, "order": 1},
-                {"latitude": 28.5265, "longitude": 77.5790, "altitude": 20, "order": 2}
-            ]
-            
-            validate_command = {
-                "type": "validate_waypoints",
-                "payload": {"waypoints": test_waypoints},
-                "id": "test_validate_1"
-            }
-            
-            await websocket.send(json.dumps(validate_command))
-            response = await websocket.recv()
-            result = json.loads(response)
-            print(f"Validate waypoints result: {result}")
-            
-            # Test 2: Calculate mission stats
-            print("\n🧪 Test 2: Calculate mission statistics")
-            stats_command = {
-                "type": "calculate_mission_stats", 
-                "payload": {"waypoints": test_waypoints},
-                "id": "test_stats_1"
-            }
-            
-            await websocket.send(json.dumps(stats_command))
-            response = await websocket.recv()
-            result = json.loads(response)
-            print(f"Mission stats result: {result}")
-            
-            # Test 3: Generate grid mission
-            print("\n🧪 Test 3: Generate grid mission")
-            grid_command = {
-                "type": "generate_grid_mission",
-                "payload": {
-                    "start_lat": 28.5245,
-                    "start_lon": 77.5770,
-                    "grid_size": 3,
-                    "spacing": 50.0,
-                    "altitude": 25.0
-                },
-                "id": "test_grid_1"
-            }
-            
-            await websocket.send(json.dumps(grid_command))
-            response = await websocket.recv()
-            result = json.loads(response)
-            print(f"Grid mission result: {result}")
-            
-            # Test 4: Generate circular mission
-            print("\n🧪 Test 4: Generate circular mission")
-            circular_command = {
-                "type": "generate_circular_mission",
-                "payload": {
-                    "center_lat": 28.5245,
-                    "center_lon": 77.5770,
-                    "radius_meters": 100.0,
-                    "num_points": 6,
-                    "altitude": 30.0
-                },
-                "id": "test_circular_1"
-            }
-            
-            await websocket.send(json.dumps(circular_command))
-            response = await websocket.recv()
-            result = json.loads(response)
-            print(f"Circular mission result: {result}")
-            
-            # Test 5: Mission status (without drone connection)
-            print("\n🧪 Test 5: Check mission status")
-            status_command = {
-                "type": "waypoint_mission_status",
-                "id": "test_status_1"
-            }
-            
-            await websocket.send(json.dumps(status_command))
-            response = await websocket.recv()
-            result = json.loads(response)
-            print(f"Mission status result: {result}")
+            # Pipeline all commands over the one connection; responses are
+            # matched back to their request by id
+            pending = {}
+            reader = asyncio.create_task(_dispatch_responses(websocket, pending))
+            try:
+                results = await asyncio.gather(
+                    *(round_trip(websocket, pending, command) for _, _, command in tests)
+                )
+            finally:
+                reader.cancel()
+            
+            for (title, label, _), result in zip(tests, results):
+                print(f"\n🧪 {title}")
+                print(f"{label}: {result}")
             
             print("\n✅ All waypoint tests completed successfully!")
             